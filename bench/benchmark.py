@@ -0,0 +1,375 @@
+from __future__ import annotations
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+from pathlib import Path
+import platform
+import random
+import socket
+import sqlite3
+import subprocess
+import tempfile
+import threading
+import time
+from typing import Any, Iterator
+import urllib.error
+import urllib.request
+from urllib.parse import quote, unquote
+
+import requests
+
+import scrape2rss
+from scrape2rss import WebsiteScraper
+
+FIXTURES_DIR = Path(__file__).with_name("fixtures")
+RESULTS_DIR = Path(__file__).with_name("results")
+
+
+def load_fixture_index() -> dict[str, dict]:
+    with (FIXTURES_DIR / "index.json").open("r", encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def summarize(values: list[float]) -> dict[str, float]:
+    return {
+        "min": round(min(values), 3) if values else 0.0,
+        "p50": round(percentile(values, 50), 3),
+        "p95": round(percentile(values, 95), 3),
+        "p99": round(percentile(values, 99), 3),
+        "max": round(max(values), 3) if values else 0.0,
+    }
+
+
+def free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port: int, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError(f"Server on port {port} did not start")
+
+
+def start_fixture_server(index: dict[str, dict]) -> tuple[ThreadingHTTPServer, str]:
+    routes: dict[str, tuple[bytes, str]] = {}
+    for url, entry in index.items():
+        body = (FIXTURES_DIR / entry["file"]).read_bytes()
+        routes[url] = (body, entry.get("content_type", "text/html; charset=utf-8"))
+
+    class FixtureHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            route = routes.get(unquote(self.path[1:]))
+            if route is None:
+                self.send_response(HTTPStatus.NOT_FOUND)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+
+            body, content_type = route
+            self.send_response(HTTPStatus.OK)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: object) -> None:
+            return
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+class LocalFetcher(scrape2rss.Fetcher):
+    def __init__(self, base_url: str, fetch_times: list[float]) -> None:
+        super().__init__()
+        self.base_url = base_url
+        self.fetch_times = fetch_times
+
+    def send(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        started = time.perf_counter()
+        try:
+            return super().send(method, f"{self.base_url}/{quote(url, safe='')}", **kwargs)
+        finally:
+            self.fetch_times.append(time.perf_counter() - started)
+
+
+@contextmanager
+def redirect_fetches(base_url: str, fetch_times: list[float]) -> Iterator[None]:
+    original_fetcher = scrape2rss.FETCHER
+    original_known = scrape2rss.KNOWN_ARTICLES
+    scrape2rss.FETCHER = LocalFetcher(base_url, fetch_times)
+    scrape2rss.KNOWN_ARTICLES = scrape2rss.KnownArticles(enabled=False)
+    try:
+        yield
+    finally:
+        scrape2rss.FETCHER = original_fetcher
+        scrape2rss.KNOWN_ARTICLES = original_known
+
+
+def record_fixtures(index: dict[str, dict]) -> None:
+    for url, entry in index.items():
+        response = requests.get(url, timeout=30)
+        if response.status_code != 200:
+            print(f"HTTP {response.status_code} when recording {url}, keeping fixture")
+            continue
+        (FIXTURES_DIR / entry["file"]).write_bytes(response.content)
+        content_type = response.headers.get("Content-Type")
+        if content_type:
+            entry["content_type"] = content_type
+        print(f"Recorded {url} ({len(response.content)} bytes)")
+
+    with (FIXTURES_DIR / "index.json").open("w", encoding="utf-8") as handle:
+        json.dump(index, handle, indent=2)
+        handle.write("\n")
+
+
+def bench_scrapers(
+    scrapers: list[type[WebsiteScraper]], base_url: str, repeat: int
+) -> list[dict]:
+    since = datetime(2000, 1, 1, tzinfo=timezone.utc)
+    results: list[dict] = []
+
+    for scraper_cls in scrapers:
+        scraper = scraper_cls()
+        fetch_times: list[float] = []
+        total_ms: list[float] = []
+        extract_ms: list[float] = []
+        article_count = 0
+
+        with redirect_fetches(base_url, fetch_times):
+            list(scrape2rss.iter_articles(scraper.get_new_articles(since)))
+            for _ in range(repeat):
+                fetch_times.clear()
+                started = time.perf_counter()
+                articles = list(scrape2rss.iter_articles(scraper.get_new_articles(since)))
+                elapsed = time.perf_counter() - started
+                article_count = len(articles)
+                total_ms.append(elapsed * 1000)
+                extract_ms.append((elapsed - sum(fetch_times)) * 1000)
+
+        if article_count == 0:
+            print(f"Warning: {scraper.meta.name} extracted no articles from its fixture")
+
+        results.append(
+            {
+                "website": scraper.meta.name,
+                "scraper": scraper_cls.__name__,
+                "articles": article_count,
+                "runs": repeat,
+                "total_ms": summarize(total_ms),
+                "extract_ms": summarize(extract_ms),
+            }
+        )
+        print(
+            f"{scraper.meta.name:<24} {article_count:>4} articles"
+            f"  extract p50 {percentile(extract_ms, 50):8.2f} ms"
+            f"  total p50 {percentile(total_ms, 50):8.2f} ms"
+        )
+
+    return results
+
+
+def seed_news(db_path: Path, rows: int) -> list[str]:
+    scrape2rss.DB_PATH = db_path
+    scrape2rss.init()
+
+    rng = random.Random(rows)
+    now = datetime.now(timezone.utc)
+    with sqlite3.connect(db_path) as connection:
+        websites = connection.execute("SELECT id, name FROM websites").fetchall()
+        batch = []
+        for index in range(rows):
+            website_id, name = websites[index % len(websites)]
+            published = now - timedelta(minutes=rng.randint(0, 60 * 24 * 365 * 5))
+            batch.append(
+                (
+                    website_id,
+                    f"https://bench.invalid/{name}/{index}",
+                    f"Synthetic article {index} for {name}",
+                    published.isoformat(),
+                    "Lorem ipsum dolor sit amet " * rng.randint(1, 20),
+                )
+            )
+        connection.executemany(
+            """
+            INSERT OR IGNORE INTO news
+                (website_id, link, title, publication_date, description)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            batch,
+        )
+        connection.commit()
+
+    return [name for _, name in websites]
+
+
+def run_clients(urls: list[str], concurrency: int, total_requests: int) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    lock = threading.Lock()
+
+    def client(offset: int) -> None:
+        nonlocal errors
+        for request_index in range(offset, total_requests, concurrency):
+            url = urls[request_index % len(urls)]
+            started = time.perf_counter()
+            try:
+                with urllib.request.urlopen(url, timeout=60) as response:
+                    response.read()
+                ok = True
+            except (urllib.error.URLError, OSError):
+                ok = False
+            elapsed = (time.perf_counter() - started) * 1000
+            with lock:
+                if ok:
+                    latencies.append(elapsed)
+                else:
+                    errors += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(client, range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "concurrency": concurrency,
+        "requests": total_requests,
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": summarize(latencies),
+    }
+
+
+def bench_server(
+    sizes: list[int], concurrency_levels: list[int], total_requests: int
+) -> list[dict]:
+    results: list[dict] = []
+    port = free_port()
+    original_db_path = scrape2rss.DB_PATH
+
+    with tempfile.TemporaryDirectory(prefix="scrape2rss-bench-") as tmp_dir:
+        website_names: set[str] = set()
+        server_thread = threading.Thread(
+            target=scrape2rss.start_server, args=(port, website_names), daemon=True
+        )
+
+        try:
+            for size in sizes:
+                names = seed_news(Path(tmp_dir) / f"rss-{size}.sqlite", size)
+                website_names.update(names)
+                if not server_thread.is_alive():
+                    server_thread.start()
+                    wait_for_port(port)
+
+                urls = [f"http://127.0.0.1:{port}/{name}/" for name in names]
+                for concurrency in concurrency_levels:
+                    result = run_clients(urls, concurrency, total_requests)
+                    result["news_rows"] = size
+                    results.append(result)
+                    print(
+                        f"rows {size:>8}  clients {concurrency:>3}"
+                        f"  {result['throughput_rps']:8.2f} req/s"
+                        f"  p50 {result['latency_ms']['p50']:8.2f} ms"
+                        f"  p95 {result['latency_ms']['p95']:8.2f} ms"
+                        f"  p99 {result['latency_ms']['p99']:8.2f} ms"
+                        f"  errors {result['errors']}"
+                    )
+        finally:
+            scrape2rss.DB_PATH = original_db_path
+
+    return results
+
+
+def git_revision() -> str | None:
+    try:
+        output = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=Path(__file__).resolve().parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.stdout.strip() or None
+
+
+def parse_int_list(value: str) -> list[int]:
+    return [int(item) for item in value.split(",") if item.strip()]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark scrapers against recorded fixtures and the RSS server"
+    )
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--sizes", type=parse_int_list, default=[1000, 10000, 50000])
+    parser.add_argument("--concurrency", type=parse_int_list, default=[1, 4, 16])
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--skip-scrapers", action="store_true")
+    parser.add_argument("--skip-server", action="store_true")
+    parser.add_argument("--record", action="store_true")
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+
+    index = load_fixture_index()
+    if args.record:
+        record_fixtures(index)
+        return
+
+    started_at = datetime.now(timezone.utc)
+    report: dict = {
+        "started_at": started_at.isoformat(),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scrapers": [],
+        "server": [],
+    }
+
+    if not args.skip_scrapers:
+        fixture_server, base_url = start_fixture_server(index)
+        try:
+            scrapers = [spec.load() for spec in scrape2rss.discover_scrapers()]
+            report["scrapers"] = bench_scrapers(scrapers, base_url, args.repeat)
+        finally:
+            fixture_server.shutdown()
+
+    if not args.skip_server:
+        report["server"] = bench_server(args.sizes, args.concurrency, args.requests)
+
+    output = args.output or RESULTS_DIR / (
+        f"benchmark-{started_at.strftime('%Y%m%dT%H%M%SZ')}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with output.open("w", encoding="utf-8") as handle:
+        json.dump(report, handle, indent=2)
+        handle.write("\n")
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
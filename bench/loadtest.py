@@ -0,0 +1,200 @@
+from __future__ import annotations
+import argparse
+from datetime import datetime, timezone
+import json
+from pathlib import Path
+import platform
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+from urllib.parse import urlencode
+
+import scrape2rss
+from bench.benchmark import (
+    RESULTS_DIR,
+    free_port,
+    git_revision,
+    parse_int_list,
+    run_clients,
+    seed_news,
+    wait_for_port,
+)
+
+ENDPOINTS = ("feed", "search", "metrics", "status")
+REPO_DIR = Path(__file__).resolve().parent.parent
+
+
+def endpoint_urls(base_url: str, endpoint: str, names: list[str], rows: int) -> list[str]:
+    rng = random.Random(rows)
+    if endpoint == "feed":
+        return [f"{base_url}/{name}/" for name in names]
+    if endpoint == "search":
+        terms = ["lorem", "synthetic article"]
+        terms += [str(rng.randrange(max(rows, 1))) for _ in range(48)]
+        return [f"{base_url}/search?{urlencode({'q': term})}" for term in terms]
+    return [f"{base_url}/{endpoint}"]
+
+
+def website_names(db_path: Path) -> list[str]:
+    with sqlite3.connect(db_path) as connection:
+        return [name for (name,) in connection.execute("SELECT name FROM websites ORDER BY name")]
+
+
+def serve(db_path: Path, port: int) -> None:
+    scrape2rss.DB_PATH = db_path
+    scrape2rss.start_server(port, set(website_names(db_path)))
+
+
+def start_server_process(db_path: Path) -> tuple[subprocess.Popen, str]:
+    port = free_port()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "bench.loadtest", "--serve", str(db_path), "--port", str(port)],
+        cwd=REPO_DIR,
+    )
+    try:
+        wait_for_port(port)
+    except RuntimeError:
+        process.kill()
+        raise
+    return process, f"http://127.0.0.1:{port}"
+
+
+def run_endpoints(
+    base_url: str,
+    names: list[str],
+    rows: int,
+    endpoints: list[str],
+    concurrency_levels: list[int],
+    total_requests: int,
+    warmup_requests: int,
+) -> list[dict]:
+    results: list[dict] = []
+    for endpoint in endpoints:
+        urls = endpoint_urls(base_url, endpoint, names, rows)
+        if warmup_requests:
+            run_clients(urls, 1, warmup_requests)
+        for concurrency in concurrency_levels:
+            result = run_clients(urls, concurrency, total_requests)
+            result["endpoint"] = endpoint
+            result["news_rows"] = rows
+            result["error_rate"] = round(result["errors"] / total_requests, 4)
+            results.append(result)
+            print(
+                f"rows {rows:>8}  {endpoint:<8} clients {concurrency:>3}"
+                f"  {result['throughput_rps']:8.2f} req/s"
+                f"  p50 {result['latency_ms']['p50']:8.2f} ms"
+                f"  p95 {result['latency_ms']['p95']:8.2f} ms"
+                f"  p99 {result['latency_ms']['p99']:8.2f} ms"
+                f"  errors {result['error_rate']:.2%}"
+            )
+    return results
+
+
+def compare(previous_path: Path, results: list[dict]) -> None:
+    with previous_path.open("r", encoding="utf-8") as handle:
+        previous = {
+            (item["news_rows"], item["endpoint"], item["concurrency"]): item
+            for item in json.load(handle)["results"]
+        }
+
+    print(f"Compared with {previous_path}:")
+    for result in results:
+        before = previous.get((result["news_rows"], result["endpoint"], result["concurrency"]))
+        if before is None:
+            continue
+
+        def change(new: float, old: float) -> str:
+            return f"{(new - old) / old:+7.1%}" if old else "    n/a"
+
+        print(
+            f"rows {result['news_rows']:>8}  {result['endpoint']:<8}"
+            f" clients {result['concurrency']:>3}"
+            f"  req/s {change(result['throughput_rps'], before['throughput_rps'])}"
+            f"  p50 {change(result['latency_ms']['p50'], before['latency_ms']['p50'])}"
+            f"  p99 {change(result['latency_ms']['p99'], before['latency_ms']['p99'])}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Load test the RSS server against synthetic news tables of several sizes"
+    )
+    parser.add_argument("--sizes", type=parse_int_list, default=[1000, 10000, 100000])
+    parser.add_argument("--concurrency", type=parse_int_list, default=[1, 8, 32])
+    parser.add_argument("--endpoints", default=",".join(ENDPOINTS))
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--warmup-requests", type=int, default=10)
+    parser.add_argument("--target", help="Base URL of an already running server to test")
+    parser.add_argument("--compare", type=Path, help="Previous loadtest JSON report")
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--serve", type=Path, help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve, args.port)
+        return
+
+    endpoints = [item.strip() for item in args.endpoints.split(",") if item.strip()]
+    unknown = set(endpoints) - set(ENDPOINTS)
+    if unknown:
+        raise SystemExit(f"Unknown endpoint(s): {', '.join(sorted(unknown))}")
+
+    started_at = datetime.now(timezone.utc)
+    results: list[dict] = []
+    if args.target:
+        names = [spec.meta.name for spec in scrape2rss.discover_scrapers()]
+        results = run_endpoints(
+            args.target.rstrip("/"),
+            names,
+            0,
+            endpoints,
+            args.concurrency,
+            args.requests,
+            args.warmup_requests,
+        )
+    else:
+        with tempfile.TemporaryDirectory(prefix="scrape2rss-loadtest-") as tmp_dir:
+            for size in args.sizes:
+                db_path = Path(tmp_dir) / f"rss-{size}.sqlite"
+                names = seed_news(db_path, size)
+                process, base_url = start_server_process(db_path)
+                try:
+                    results += run_endpoints(
+                        base_url,
+                        names,
+                        size,
+                        endpoints,
+                        args.concurrency,
+                        args.requests,
+                        args.warmup_requests,
+                    )
+                finally:
+                    process.terminate()
+                    process.wait()
+
+    report = {
+        "started_at": started_at.isoformat(),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "target": args.target,
+        "results": results,
+    }
+    output = args.output or RESULTS_DIR / (
+        f"loadtest-{started_at.strftime('%Y%m%dT%H%M%SZ')}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with output.open("w", encoding="utf-8") as handle:
+        json.dump(report, handle, indent=2)
+        handle.write("\n")
+    print(f"Results written to {output}")
+
+    if args.compare:
+        compare(args.compare, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+from __future__ import annotations
+import argparse
+from collections import deque
+from datetime import datetime, timezone
+import json
+import os
+from pathlib import Path
+import random
+import statistics
+import tempfile
+import threading
+import time
+import tracemalloc
+from typing import Any
+import urllib.error
+import urllib.request
+
+import requests
+
+import scrape2rss
+from bench.benchmark import (
+    RESULTS_DIR,
+    LocalFetcher,
+    free_port,
+    git_revision,
+    load_fixture_index,
+    start_fixture_server,
+    wait_for_port,
+)
+
+
+class FlakyFetcher(LocalFetcher):
+    def __init__(self, base_url: str, error_rate: float) -> None:
+        super().__init__(base_url, deque(maxlen=1000))
+        self.error_rate = error_rate
+
+    def send(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        if self.error_rate and random.random() < self.error_rate:
+            raise requests.ConnectionError(f"Injected failure for {url}")
+        return super().send(method, url, **kwargs)
+
+
+def rss_bytes() -> int | None:
+    try:
+        with open("/proc/self/status", encoding="ascii") as handle:
+            for line in handle:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def open_fds() -> int | None:
+    for path in ("/proc/self/fd", "/dev/fd"):
+        try:
+            return len(os.listdir(path))
+        except OSError:
+            continue
+    return None
+
+
+def sample(started: float) -> dict[str, float | None]:
+    return {
+        "elapsed_s": round(time.monotonic() - started, 1),
+        "rss_mb": round(rss / 2**20, 2) if (rss := rss_bytes()) is not None else None,
+        "heap_mb": (
+            round(tracemalloc.get_traced_memory()[0] / 2**20, 2)
+            if tracemalloc.is_tracing()
+            else None
+        ),
+        "fds": open_fds(),
+        "threads": threading.active_count(),
+    }
+
+
+def poll_feeds(urls: list[str], stop: threading.Event, counters: dict[str, int]) -> None:
+    while not stop.is_set():
+        for url in urls:
+            if stop.is_set():
+                return
+            try:
+                with urllib.request.urlopen(url, timeout=30) as response:
+                    response.read()
+                counters["ok"] += 1
+            except (urllib.error.URLError, OSError):
+                counters["errors"] += 1
+
+
+def window_median(samples: list[dict], key: str) -> float | None:
+    values = [item[key] for item in samples if item[key] is not None]
+    return statistics.median(values) if values else None
+
+
+def check_growth(samples: list[dict], window: int, limits: dict[str, float]) -> dict[str, dict]:
+    first, last = samples[:window], samples[-window:]
+    growth: dict[str, dict] = {}
+    for key, limit in limits.items():
+        baseline, final = window_median(first, key), window_median(last, key)
+        if baseline is None or final is None:
+            continue
+        growth[key] = {
+            "baseline": baseline,
+            "final": final,
+            "growth": round(final - baseline, 2),
+            "limit": limit,
+            "ok": final - baseline <= limit,
+        }
+    return growth
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Run scrapers and feed polling for a long time and check for resource leaks"
+    )
+    parser.add_argument("--duration", type=float, default=3600, help="Seconds to run")
+    parser.add_argument("--cycle-seconds", type=int, default=5, help="Scrape interval")
+    parser.add_argument("--sample-seconds", type=float, default=10)
+    parser.add_argument("--warmup", type=float, default=60, help="Seconds ignored at start")
+    parser.add_argument("--window", type=int, default=6, help="Samples per comparison window")
+    parser.add_argument("--pollers", type=int, default=4)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Injected fetch failures")
+    parser.add_argument("--export", action="store_true", help="Serve feeds from static files")
+    parser.add_argument("--no-tracemalloc", action="store_true")
+    parser.add_argument("--max-rss-growth-mb", type=float, default=50)
+    parser.add_argument("--max-heap-growth-mb", type=float, default=20)
+    parser.add_argument("--max-fd-growth", type=float, default=10)
+    parser.add_argument("--max-thread-growth", type=float, default=5)
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+
+    if not args.no_tracemalloc:
+        tracemalloc.start()
+
+    started_at = datetime.now(timezone.utc)
+    tmp_dir = Path(tempfile.mkdtemp(prefix="scrape2rss-soak-"))
+    scrape2rss.DB_PATH = tmp_dir / "rss.sqlite"
+    scrape2rss.BREAKERS = scrape2rss.CircuitBreakers(
+        max_backoff_seconds=args.cycle_seconds * 8
+    )
+    if args.export:
+        scrape2rss.EXPORT_DIR = tmp_dir / "feeds"
+
+    fixture_server, base_url = start_fixture_server(load_fixture_index())
+    scrape2rss.FETCHER = FlakyFetcher(base_url, args.error_rate)
+
+    specs = scrape2rss.discover_scrapers()
+    for spec in specs:
+        spec.interval_seconds = None
+    scrape2rss.init(specs)
+    names = sorted(spec.meta.name for spec in specs)
+
+    port = free_port()
+    threading.Thread(
+        target=scrape2rss.start_server, args=(port, set(names)), daemon=True
+    ).start()
+    wait_for_port(port)
+    scrape2rss.start_scrapers(specs, args.cycle_seconds, restart_delay_seconds=args.cycle_seconds)
+
+    urls = [f"http://127.0.0.1:{port}/{name}/" for name in names]
+    urls += [f"http://127.0.0.1:{port}/metrics", f"http://127.0.0.1:{port}/search?q=release"]
+    stop = threading.Event()
+    counters = {"ok": 0, "errors": 0}
+    pollers = [
+        threading.Thread(target=poll_feeds, args=(urls, stop, counters), daemon=True)
+        for _ in range(args.pollers)
+    ]
+    for poller in pollers:
+        poller.start()
+
+    started = time.monotonic()
+    samples: list[dict] = []
+    baseline_snapshot = None
+    print(
+        f"Soaking for {args.duration:.0f}s with a {args.cycle_seconds}s scrape cycle"
+        f" and {args.pollers} pollers (data in {tmp_dir})"
+    )
+    try:
+        while time.monotonic() - started < args.duration:
+            time.sleep(args.sample_seconds)
+            if time.monotonic() - started < args.warmup:
+                continue
+            current = sample(started)
+            samples.append(current)
+            if baseline_snapshot is None and tracemalloc.is_tracing():
+                baseline_snapshot = tracemalloc.take_snapshot()
+            print(
+                f"{current['elapsed_s']:>8.0f}s  rss {current['rss_mb']} MB"
+                f"  heap {current['heap_mb']} MB  fds {current['fds']}"
+                f"  threads {current['threads']}  polls {counters['ok']}"
+                f"  errors {counters['errors']}"
+            )
+    except KeyboardInterrupt:
+        print("Interrupted, checking the samples collected so far")
+    finally:
+        stop.set()
+        fixture_server.shutdown()
+
+    window = max(1, min(args.window, len(samples) // 2))
+    growth = check_growth(
+        samples,
+        window,
+        {
+            "rss_mb": args.max_rss_growth_mb,
+            "heap_mb": args.max_heap_growth_mb,
+            "fds": args.max_fd_growth,
+            "threads": args.max_thread_growth,
+        },
+    )
+
+    if baseline_snapshot is not None:
+        stats = tracemalloc.take_snapshot().compare_to(baseline_snapshot, "lineno")
+        print("Largest allocation growth since the first sample:")
+        for stat in stats[:10]:
+            print(f"  {stat}")
+
+    report = {
+        "started_at": started_at.isoformat(),
+        "git_revision": git_revision(),
+        "options": {key: value for key, value in vars(args).items() if key != "output"},
+        "polls": counters,
+        "growth": growth,
+        "samples": samples,
+    }
+    output = args.output or RESULTS_DIR / f"soak-{started_at.strftime('%Y%m%dT%H%M%SZ')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with output.open("w", encoding="utf-8") as handle:
+        json.dump(report, handle, indent=2)
+        handle.write("\n")
+    print(f"Results written to {output}")
+
+    if len(samples) < 2:
+        raise SystemExit("Not enough samples after warmup to check growth")
+    failed = [key for key, result in growth.items() if not result["ok"]]
+    for key, result in growth.items():
+        status = "ok" if result["ok"] else "FAIL"
+        print(
+            f"{key:<8} {result['baseline']:>10} -> {result['final']:>10}"
+            f"  growth {result['growth']:>8} (limit {result['limit']})  {status}"
+        )
+    if failed:
+        raise SystemExit(f"Resource growth beyond threshold: {', '.join(failed)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+from __future__ import annotations
+import argparse
+from dataclasses import dataclass, field
+import hashlib
+import hmac
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import threading
+import time
+import urllib.request
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+
+@dataclass
+class Subscriber:
+    secret: str | None = None
+    verified: list[dict[str, str]] = field(default_factory=list)
+    pushes: list[tuple[bytes, bool | None]] = field(default_factory=list)
+    event: threading.Event = field(default_factory=threading.Event)
+
+
+def start_subscriber(
+    subscriber: Subscriber, port: int = 0
+) -> tuple[ThreadingHTTPServer, str]:
+    class CallbackHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            params = {
+                key: values[0] for key, values in parse_qs(urlsplit(self.path).query).items()
+            }
+            challenge = params.get("hub.challenge", "").encode("utf-8")
+            subscriber.verified.append(params)
+            print(f"Verified {params.get('hub.mode')} for {params.get('hub.topic')}")
+            self.send_response(HTTPStatus.OK)
+            self.send_header("Content-Length", str(len(challenge)))
+            self.end_headers()
+            self.wfile.write(challenge)
+            subscriber.event.set()
+
+        def do_POST(self) -> None:
+            body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            signature = "unchecked"
+            signature_ok: bool | None = None
+            if subscriber.secret is not None:
+                expected = hmac.new(
+                    subscriber.secret.encode("utf-8"), body, hashlib.sha256
+                ).hexdigest()
+                signature_ok = hmac.compare_digest(
+                    self.headers.get("X-Hub-Signature", ""), f"sha256={expected}"
+                )
+                signature = "ok" if signature_ok else "invalid"
+            subscriber.pushes.append((body, signature_ok))
+            print(f"Push of {len(body)} bytes, signature {signature}")
+            self.send_response(HTTPStatus.NO_CONTENT)
+            self.end_headers()
+            subscriber.event.set()
+
+        def log_message(self, format: str, *args: object) -> None:
+            return
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), CallbackHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/callback"
+
+
+def send_hub_request(
+    hub_url: str,
+    mode: str,
+    topic: str,
+    callback: str,
+    secret: str | None = None,
+    lease_seconds: int | None = None,
+) -> int:
+    params = {"hub.mode": mode, "hub.topic": topic, "hub.callback": callback}
+    if secret:
+        params["hub.secret"] = secret
+    if lease_seconds:
+        params["hub.lease_seconds"] = str(lease_seconds)
+    request = urllib.request.Request(
+        hub_url, data=urlencode(params).encode("utf-8"), method="POST"
+    )
+    with urllib.request.urlopen(request, timeout=10) as response:
+        return response.status
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Subscribe a local callback to a scrape2rss WebSub hub and print pushes"
+    )
+    parser.add_argument("--hub", default="http://localhost:8082/hub")
+    parser.add_argument(
+        "--topic", required=True, help="Feed URL, e.g. http://localhost:8082/kyutai/"
+    )
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--secret")
+    parser.add_argument("--lease-seconds", type=int)
+    args = parser.parse_args()
+
+    subscriber = Subscriber(secret=args.secret)
+    server, callback = start_subscriber(subscriber, args.port)
+    status = send_hub_request(
+        args.hub, "subscribe", args.topic, callback, args.secret, args.lease_seconds
+    )
+    print(f"Subscribed {callback} to {args.topic} (hub answered {status})")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        send_hub_request(args.hub, "unsubscribe", args.topic, callback)
+        subscriber.event.clear()
+        subscriber.event.wait(5)
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,63 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
+import argparse
+import ast
+import asyncio
+import codecs
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import suppress
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+import gzip
+import hashlib
+import hmac
 from http import HTTPStatus
-from http.server import BaseHTTPRequestHandler, HTTPServer
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 import importlib.util
+import io
+import json
+import os
 from pathlib import Path
+import queue
+import random
+import re
+import socket
 import sqlite3
 import sys
+import tempfile
 import threading
 import time
-from typing import Sequence
+from types import CoroutineType, ModuleType
+import uuid
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterable,
+    Callable,
+    Generator,
+    Hashable,
+    Iterable,
+    Iterator,
+    Sequence,
+    TypeVar,
+)
+import urllib.error
+from urllib.parse import parse_qs, urlencode, urlsplit
+import urllib.request
+from urllib.robotparser import RobotFileParser
 import xml.etree.ElementTree as ET
+import zlib
 import yaml
 
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+    import requests
+
+DB_PATH = Path(__file__).with_name("rss.sqlite")
+EXPORT_DIR: Path | None = None
+ATOM_NS = "http://www.w3.org/2005/Atom"
+ET.register_namespace("atom", ATOM_NS)
+
 @dataclass(frozen=True, slots=True)
 class WebsiteMeta:
     name: str
@@ -29,41 +73,811 @@ class Article:
     published: datetime
     summary: str | None = None
 
+ArticleSource = Iterable[Article] | AsyncIterable[Article]
+
 class WebsiteScraper(ABC):
     meta: WebsiteMeta
     interval_seconds: int = 300
+    chunk_size: int = 100
+    sitemap_url: str | None = None
+    deadline_seconds: float | None = None
+
+    def __init__(self) -> None:
+        self.fetch_errors: list[str] = []
+        self.deadline: float | None = None
+        self.cursor: Any = None
+        self.changed_urls: list[str] | None = None
+        self.origins: set[str] = set()
 
     @abstractmethod
-    def get_new_articles(self, since: datetime) -> Sequence[Article]:
+    def get_new_articles(self, since: datetime) -> ArticleSource:
         raise NotImplementedError
 
+    def fetch(self, url: str, **kwargs: Any) -> requests.Response:
+        parts = urlsplit(url)
+        self.origins.add(f"{parts.scheme}://{parts.netloc}/")
+        try:
+            response = FETCHER.request("GET", url, deadline=self.deadline, **kwargs)
+        except Exception as exc:
+            self.fetch_errors.append(f"{url}: {exc}")
+            raise
+        if response.status_code >= 400:
+            self.fetch_errors.append(f"{url}: HTTP {response.status_code}")
+        return response
 
-def discover_scrapers(websites_dir: Path | None = None) -> list[type[WebsiteScraper]]:
-    base_dir = websites_dir or Path(__file__).with_name("websites")
-    if not base_dir.exists():
-        return []
+    def is_known(self, url: str) -> bool:
+        return KNOWN_ARTICLES.contains(self.meta.name, url)
+
+
+FETCH_MODES = ("live", "record", "replay")
+
+
+class ResponseTooLarge(Exception):
+    pass
+
+
+class DeadlineExceeded(TimeoutError):
+    pass
+
+
+def remaining_seconds(deadline: float | None, url: str) -> float | None:
+    if deadline is None:
+        return None
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise DeadlineExceeded(f"{url}: scrape deadline exceeded")
+    return remaining
+
+
+def abort_response(response: requests.Response) -> None:
+    body = getattr(getattr(response.raw, "_fp", None), "fp", None)
+    sock = getattr(getattr(body, "raw", None), "_sock", None)
+    if sock is None:
+        sock = getattr(getattr(response.raw, "_connection", None), "sock", None)
+    if sock is not None:
+        with suppress(OSError):
+            sock.shutdown(socket.SHUT_RDWR)
+
+
+def read_body(response: requests.Response, max_bytes: int) -> None:
+    declared = response.headers.get("Content-Length", "")
+    if max_bytes and declared.isdigit() and int(declared) > max_bytes:
+        raise ResponseTooLarge(f"{response.url}: {declared} bytes exceeds {max_bytes}")
+
+    body = bytearray()
+    for chunk in response.iter_content(64 * 1024):
+        body += chunk
+        if max_bytes and len(body) > max_bytes:
+            raise ResponseTooLarge(f"{response.url}: body exceeds {max_bytes} bytes")
+    response._content = bytes(body)
+
+
+HOST_ENCODINGS: dict[str, str] = {}
+META_CHARSET = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([a-z0-9_.:-]+)""", re.IGNORECASE)
+
+
+def known_encoding(name: str | bytes | None) -> str | None:
+    if isinstance(name, bytes):
+        name = name.decode("ascii", "ignore")
+    if not name:
+        return None
+    try:
+        return codecs.lookup(name.strip()).name
+    except LookupError:
+        return None
+
+
+def response_encoding(response: requests.Response) -> str | None:
+    content_type = response.headers.get("Content-Type", "")
+    for parameter in content_type.split(";")[1:]:
+        key, _, value = parameter.partition("=")
+        if key.strip().lower() == "charset":
+            encoding = known_encoding(value.strip().strip("\"'"))
+            if encoding is not None:
+                return encoding
+
+    match = META_CHARSET.search(response.content[:4096])
+    return known_encoding(match.group(1)) if match else None
+
+
+def parse_html(response: requests.Response, features: str = "html.parser") -> BeautifulSoup:
+    from bs4 import BeautifulSoup
+
+    host = urlsplit(response.url).netloc
+    declared = response_encoding(response)
+    soup = BeautifulSoup(
+        response.content, features, from_encoding=declared or HOST_ENCODINGS.get(host)
+    )
+    detected = known_encoding(soup.original_encoding)
+    if declared is None and detected is not None:
+        HOST_ENCODINGS[host] = detected
+    return soup
+
+
+class FetchArchive:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._cursors: dict[tuple[str, str], int] = {}
+        with sqlite3.connect(self.path) as connection:
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS bodies (
+                    sha256 TEXT PRIMARY KEY,
+                    data BLOB NOT NULL
+                )
+                """
+            )
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS exchanges (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    method TEXT NOT NULL,
+                    url TEXT NOT NULL,
+                    request_headers TEXT NOT NULL,
+                    status INTEGER DEFAULT NULL,
+                    response_headers TEXT DEFAULT NULL,
+                    body_sha256 TEXT DEFAULT NULL,
+                    error_type TEXT DEFAULT NULL,
+                    error TEXT DEFAULT NULL,
+                    elapsed REAL NOT NULL,
+                    recorded_at TEXT NOT NULL,
+                    FOREIGN KEY (body_sha256) REFERENCES bodies(sha256)
+                )
+                """
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS exchanges_method_url ON exchanges (method, url)"
+            )
+
+    def record(
+        self,
+        method: str,
+        url: str,
+        request_headers: dict[str, str],
+        elapsed: float,
+        response: requests.Response | None = None,
+        error: Exception | None = None,
+    ) -> None:
+        body_sha256 = None
+        compressed = None
+        if response is not None:
+            body_sha256 = hashlib.sha256(response.content).hexdigest()
+            compressed = zlib.compress(response.content, 9)
+
+        with self._lock, sqlite3.connect(self.path) as connection:
+            if body_sha256 is not None:
+                connection.execute(
+                    "INSERT OR IGNORE INTO bodies (sha256, data) VALUES (?, ?)",
+                    (body_sha256, compressed),
+                )
+            connection.execute(
+                """
+                INSERT INTO exchanges (
+                    method, url, request_headers, status, response_headers,
+                    body_sha256, error_type, error, elapsed, recorded_at
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    method,
+                    url,
+                    json.dumps(request_headers),
+                    response.status_code if response is not None else None,
+                    json.dumps(dict(response.headers)) if response is not None else None,
+                    body_sha256,
+                    type(error).__name__ if error is not None else None,
+                    str(error) if error is not None else None,
+                    elapsed,
+                    datetime.now(timezone.utc).isoformat(),
+                ),
+            )
+            connection.commit()
+
+    def next_exchange(self, method: str, url: str) -> sqlite3.Row | None:
+        with self._lock, sqlite3.connect(self.path) as connection:
+            connection.row_factory = sqlite3.Row
+            (count,) = connection.execute(
+                "SELECT COUNT(*) FROM exchanges WHERE method = ? AND url = ?",
+                (method, url),
+            ).fetchone()
+            if not count:
+                return None
+
+            cursor = self._cursors.get((method, url), 0)
+            self._cursors[(method, url)] = cursor + 1
+            return connection.execute(
+                """
+                SELECT exchanges.*, bodies.data AS body
+                FROM (
+                    SELECT * FROM exchanges
+                    WHERE method = ? AND url = ?
+                    ORDER BY id
+                    LIMIT 1 OFFSET ?
+                ) AS exchanges
+                LEFT JOIN bodies ON bodies.sha256 = exchanges.body_sha256
+                """,
+                (method, url, cursor % count),
+            ).fetchone()
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: float) -> None:
+        self.base_rate = self.rate = rate
+        self.base_burst = self.burst = max(1.0, burst)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def limit(self, rate: float | None) -> None:
+        with self._lock:
+            if rate is None:
+                self.rate, self.burst = self.base_rate, self.base_burst
+            else:
+                self.rate = min(self.base_rate, rate) if self.base_rate > 0 else rate
+                self.burst = 1.0
+            self.tokens = min(self.tokens, self.burst)
+
+    def acquire(self, deadline: float | None = None) -> float:
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if self.rate > 0:
+                    self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                else:
+                    self.tokens = self.burst
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = (1 - self.tokens) / self.rate
+            if deadline is not None and now + delay > deadline:
+                raise DeadlineExceeded("scrape deadline exceeded waiting for a request token")
+            time.sleep(delay)
+            waited += delay
+
+
+@dataclass(slots=True)
+class HostBudget:
+    bucket: TokenBucket
+    slots: threading.BoundedSemaphore
+    robots_lock: threading.Lock
+    robots_checked_at: float | None = None
+
+
+class Politeness:
+    def __init__(
+        self,
+        requests_per_second: float = 1.0,
+        burst: float = 2,
+        max_concurrency: int = 2,
+        respect_robots: bool = True,
+        robots_ttl_seconds: float = 24 * 3600,
+        user_agent: str = "*",
+        hosts: dict[str, dict] | None = None,
+    ) -> None:
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self.max_concurrency = max(1, max_concurrency)
+        self.respect_robots = respect_robots
+        self.robots_ttl_seconds = robots_ttl_seconds
+        self.user_agent = user_agent
+        self.hosts = {host.lower(): options or {} for host, options in (hosts or {}).items()}
+        self._budgets: dict[str, HostBudget] = {}
+        self._lock = threading.Lock()
+
+    def budget(self, host: str) -> HostBudget:
+        with self._lock:
+            budget = self._budgets.get(host)
+            if budget is None:
+                options = self.hosts.get(host, {})
+                budget = HostBudget(
+                    bucket=TokenBucket(
+                        float(options.get("requests_per_second", self.requests_per_second)),
+                        float(options.get("burst", self.burst)),
+                    ),
+                    slots=threading.BoundedSemaphore(
+                        max(1, int(options.get("max_concurrency", self.max_concurrency)))
+                    ),
+                    robots_lock=threading.Lock(),
+                )
+                self._budgets[host] = budget
+            return budget
+
+    def apply_robots(
+        self,
+        scheme: str,
+        host: str,
+        budget: HostBudget,
+        send: Callable[..., requests.Response],
+    ) -> None:
+        with budget.robots_lock:
+            checked_at = budget.robots_checked_at
+            if checked_at is not None and time.monotonic() - checked_at < self.robots_ttl_seconds:
+                return
+            budget.robots_checked_at = time.monotonic()
+            self.read_robots(scheme, host, budget, send)
+
+    def read_robots(
+        self,
+        scheme: str,
+        host: str,
+        budget: HostBudget,
+        send: Callable[..., requests.Response],
+    ) -> None:
+        parser = RobotFileParser()
+        try:
+            response = send("GET", f"{scheme}://{host}/robots.txt", timeout=10)
+            if response.status_code != 200:
+                return
+            parser.parse(response.text.splitlines())
+            parser.modified()
+        except Exception as exc:
+            print(f"Could not read robots.txt for {host}: {exc}")
+            return
+
+        crawl_delay = parser.crawl_delay(self.user_agent)
+        request_rate = parser.request_rate(self.user_agent)
+        rate = 0.0
+        if crawl_delay:
+            rate = 1 / float(crawl_delay)
+        if request_rate and request_rate.requests:
+            rate = min(rate or float("inf"), request_rate.requests / request_rate.seconds)
+        budget.bucket.limit(rate or None)
+        METRICS.set("fetch_host_rate_limit", budget.bucket.rate, host=host)
+
+    def wait(
+        self, url: str, send: Callable[..., requests.Response], deadline: float | None = None
+    ) -> HostBudget:
+        parts = urlsplit(url)
+        host = parts.netloc.lower()
+        budget = self.budget(host)
+        if self.respect_robots:
+            self.apply_robots(parts.scheme or "https", host, budget, send)
+
+        if not budget.slots.acquire(timeout=remaining_seconds(deadline, url)):
+            raise DeadlineExceeded(f"{url}: scrape deadline exceeded waiting for {host}")
+        try:
+            waited = budget.bucket.acquire(deadline)
+        except BaseException:
+            budget.slots.release()
+            raise
+        if waited:
+            METRICS.incr("fetch_throttled_seconds_total", waited, host=host)
+        return budget
+
+
+class DnsCache:
+    def __init__(self, ttl_seconds: float = 300, stale_seconds: float = 3600) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self._entries: dict[tuple[str, int, int], tuple[float, list[tuple]]] = {}
+        self._lookups = SingleFlight()
+        self._lock = threading.Lock()
+
+    def resolve(self, host: str, port: int, family: int = socket.AF_UNSPEC) -> list[tuple]:
+        key = (host.lower(), port, family)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and time.monotonic() < entry[0]:
+            METRICS.incr("dns_cache_hits_total", host=key[0])
+            return entry[1]
+
+        try:
+            addresses, _ = self._lookups.do(key, self.lookup, key)
+        except OSError:
+            if entry is None or time.monotonic() >= entry[0] + self.stale_seconds:
+                raise
+            METRICS.incr("dns_stale_answers_total", host=key[0])
+            return entry[1]
+        return addresses
+
+    def lookup(self, key: tuple[str, int, int]) -> list[tuple]:
+        host, port, family = key
+        METRICS.incr("dns_lookups_total", host=host)
+        addresses = socket.getaddrinfo(host, port, family, socket.SOCK_STREAM)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, addresses)
+        return addresses
+
+    def install(self) -> None:
+        from urllib3.util import connection
+
+        create_connection = getattr(
+            connection.create_connection, "__wrapped__", connection.create_connection
+        )
+
+        def cached_create_connection(
+            address: tuple[str, int], *args: Any, **kwargs: Any
+        ) -> socket.socket:
+            host, port = address
+            error: OSError | None = None
+            for *_, sockaddr in self.resolve(
+                host.strip("[]"), port, connection.allowed_gai_family()
+            ):
+                try:
+                    return create_connection((sockaddr[0], port), *args, **kwargs)
+                except OSError as exc:
+                    error = exc
+            raise error or OSError(f"No address found for {host}")
+
+        cached_create_connection.__wrapped__ = create_connection
+        connection.create_connection = cached_create_connection
+
+
+class Fetcher:
+    def __init__(
+        self,
+        mode: str = "live",
+        archive_path: Path | None = None,
+        replay_latency: bool = False,
+        politeness: Politeness | None = None,
+        max_body_bytes: int = 10 * 1024 * 1024,
+        preconnect_seconds: float = 0,
+    ) -> None:
+        if mode not in FETCH_MODES:
+            raise ValueError(f"Unknown fetch mode {mode!r}, expected one of {FETCH_MODES}")
+        self.mode = mode
+        self.replay_latency = replay_latency
+        self.politeness = politeness
+        self.max_body_bytes = max_body_bytes
+        self.preconnect_seconds = preconnect_seconds if mode != "replay" else 0
+        self.archive = (
+            FetchArchive(archive_path or Path(__file__).with_name("fetch_archive.sqlite"))
+            if mode != "live"
+            else None
+        )
+        self._session: requests.Session | None = None
+        self._lock = threading.Lock()
+
+    def session(self) -> requests.Session:
+        import requests
+
+        with self._lock:
+            if self._session is None:
+                self._session = requests.Session()
+            return self._session
+
+    def preconnect(self, urls: Iterable[str]) -> None:
+        import requests
+
+        session = self.session()
+        for url in {f"{parts.scheme}://{parts.netloc}/" for parts in map(urlsplit, urls)}:
+            host = urlsplit(url).netloc
+            started = time.perf_counter()
+            try:
+                settings = session.merge_environment_settings(url, {}, None, None, None)
+                pool = session.get_adapter(url).get_connection_with_tls_context(
+                    requests.Request("GET", url).prepare(),
+                    settings["verify"],
+                    settings["proxies"],
+                    settings["cert"],
+                )
+                connection = pool._get_conn()
+                try:
+                    if not connection.is_connected:
+                        connection.timeout = self.preconnect_seconds
+                        connection.connect()
+                finally:
+                    pool._put_conn(connection)
+            except Exception as exc:
+                METRICS.incr("fetch_preconnect_failures_total", host=host)
+                print(f"Could not pre-connect to {host}: {exc}")
+                continue
+            METRICS.incr("fetch_preconnects_total", host=host)
+            METRICS.incr(
+                "fetch_preconnect_seconds_total", time.perf_counter() - started, host=host
+            )
+
+    def request(
+        self, method: str, url: str, deadline: float | None = None, **kwargs: Any
+    ) -> requests.Response:
+        if self.mode == "replay":
+            remaining_seconds(deadline, url)
+            return self.replay(method, url)
+        if self.politeness is None:
+            return self.exchange(method, url, deadline, **kwargs)
+
+        budget = self.politeness.wait(url, self.send, deadline)
+        try:
+            return self.exchange(method, url, deadline, **kwargs)
+        finally:
+            budget.slots.release()
+
+    def exchange(
+        self, method: str, url: str, deadline: float | None = None, **kwargs: Any
+    ) -> requests.Response:
+        if self.mode == "live":
+            return self.send(method, url, deadline=deadline, **kwargs)
+
+        started = time.perf_counter()
+        try:
+            response = self.send(method, url, deadline=deadline, **kwargs)
+        except Exception as exc:
+            self.archive.record(
+                method,
+                url,
+                dict(kwargs.get("headers") or {}),
+                time.perf_counter() - started,
+                error=exc,
+            )
+            raise
+
+        self.archive.record(
+            method,
+            url,
+            dict(response.request.headers),
+            time.perf_counter() - started,
+            response=response,
+        )
+        return response
+
+    def send(
+        self, method: str, url: str, deadline: float | None = None, **kwargs: Any
+    ) -> requests.Response:
+        remaining = remaining_seconds(deadline, url)
+        if remaining is None:
+            response = self.session().request(method, url, stream=True, **kwargs)
+            try:
+                read_body(response, self.max_body_bytes)
+            finally:
+                response.close()
+            return response
+
+        timeout = kwargs.get("timeout")
+        if isinstance(timeout, tuple):
+            kwargs["timeout"] = tuple(min(part or remaining, remaining) for part in timeout)
+        else:
+            kwargs["timeout"] = min(timeout or remaining, remaining)
+        try:
+            response = self.session().request(method, url, stream=True, **kwargs)
+            watchdog = threading.Timer(
+                max(deadline - time.monotonic(), 0), abort_response, args=(response,)
+            )
+            watchdog.daemon = True
+            watchdog.start()
+            try:
+                read_body(response, self.max_body_bytes)
+            finally:
+                watchdog.cancel()
+                response.close()
+        except Exception as exc:
+            if time.monotonic() >= deadline:
+                raise DeadlineExceeded(f"{url}: scrape deadline exceeded") from exc
+            raise
+        remaining_seconds(deadline, url)
+        return response
+
+    def replay(self, method: str, url: str) -> requests.Response:
+        import requests
+        from requests.structures import CaseInsensitiveDict
+        from requests.utils import get_encoding_from_headers
+
+        exchange = self.archive.next_exchange(method, url)
+        if exchange is None:
+            raise requests.ConnectionError(f"No recorded exchange for {method} {url}")
+
+        if self.replay_latency:
+            time.sleep(exchange["elapsed"])
+
+        if exchange["error_type"] is not None:
+            error_cls = getattr(requests.exceptions, exchange["error_type"], None)
+            if not (isinstance(error_cls, type) and issubclass(error_cls, Exception)):
+                error_cls = requests.RequestException
+            raise error_cls(exchange["error"])
+
+        response = requests.Response()
+        response.status_code = exchange["status"]
+        response.headers = CaseInsensitiveDict(json.loads(exchange["response_headers"]))
+        response._content = (
+            zlib.decompress(exchange["body"]) if exchange["body"] is not None else b""
+        )
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = url
+        response.elapsed = timedelta(seconds=exchange["elapsed"])
+        response.request = requests.Request(
+            method, url, headers=json.loads(exchange["request_headers"])
+        ).prepare()
+        try:
+            response.reason = HTTPStatus(response.status_code).phrase
+        except ValueError:
+            response.reason = None
+        return response
+
+
+FETCHER = Fetcher()
+
+
+def politeness_from_config(config: dict) -> Politeness | None:
+    politeness_config = config_section(config, "politeness")
+    if not politeness_config.get("enabled", True):
+        return None
+    return Politeness(
+        requests_per_second=float(politeness_config.get("requests_per_second", 1.0)),
+        burst=float(politeness_config.get("burst", 2)),
+        max_concurrency=int(politeness_config.get("max_concurrency", 2)),
+        respect_robots=bool(politeness_config.get("respect_robots", True)),
+        robots_ttl_seconds=float(politeness_config.get("robots_ttl_seconds", 24 * 3600)),
+        user_agent=politeness_config.get("user_agent") or "*",
+        hosts=politeness_config.get("hosts") or {},
+    )
+
+
+def configure_fetcher(config: dict) -> None:
+    global FETCHER
+
+    fetch_config = config_section(config, "fetch")
+    archive = fetch_config.get("archive")
+    mode = fetch_config.get("mode") or "live"
+    dns_cache_seconds = float(fetch_config.get("dns_cache_seconds", 300))
+    if dns_cache_seconds and mode != "replay":
+        DnsCache(
+            ttl_seconds=dns_cache_seconds,
+            stale_seconds=float(fetch_config.get("dns_stale_seconds", 3600)),
+        ).install()
+    FETCHER = Fetcher(
+        mode=mode,
+        archive_path=Path(archive) if archive else None,
+        replay_latency=bool(fetch_config.get("replay_latency", False)),
+        politeness=politeness_from_config(config),
+        max_body_bytes=int(fetch_config.get("max_body_bytes", 10 * 1024 * 1024)),
+        preconnect_seconds=float(fetch_config.get("preconnect_seconds", 0)),
+    )
+
+
+@dataclass(slots=True)
+class ScraperSpec:
+    module_path: Path
+    class_name: str
+    meta: WebsiteMeta
+    interval_seconds: int | None = None
+    scraper_cls: type[WebsiteScraper] | None = None
+
+    def load(self) -> type[WebsiteScraper]:
+        with _MODULE_LOCK:
+            if self.scraper_cls is None:
+                module = load_module(self.module_path)
+                scraper_cls = getattr(module, self.class_name, None)
+                if not (
+                    isinstance(scraper_cls, type)
+                    and issubclass(scraper_cls, WebsiteScraper)
+                ):
+                    raise RuntimeError(
+                        f"{self.class_name} is not a WebsiteScraper in {self.module_path}"
+                    )
+                self.scraper_cls = scraper_cls
+            return self.scraper_cls
+
+
+_MODULE_LOCK = threading.RLock()
+_LOADED_MODULES: dict[Path, ModuleType] = {}
 
-    scrapers: list[type[WebsiteScraper]] = []
-    for module_path in sorted(base_dir.glob("*.py")):
-        if module_path.name == "__init__.py":
-            continue
+
+def load_module(module_path: Path, reload: bool = False) -> ModuleType:
+    with _MODULE_LOCK:
+        module = _LOADED_MODULES.get(module_path)
+        if module is not None and not reload:
+            return module
 
         module_name = f"websites.{module_path.stem}"
         spec = importlib.util.spec_from_file_location(module_name, module_path)
         if spec is None or spec.loader is None:
-            continue
+            raise ImportError(f"Cannot load scraper module {module_path}")
 
         module = importlib.util.module_from_spec(spec)
         sys.modules[module_name] = module
         spec.loader.exec_module(module)
+        _LOADED_MODULES[module_path] = module
+        return module
+
+
+def read_manifest(module_path: Path) -> list[ScraperSpec] | None:
+    try:
+        tree = ast.parse(module_path.read_text(encoding="utf-8"), str(module_path))
+    except (OSError, SyntaxError, UnicodeDecodeError):
+        return None
+
+    specs: list[ScraperSpec] = []
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        base_names = {
+            base.id if isinstance(base, ast.Name) else getattr(base, "attr", None)
+            for base in node.bases
+        }
+        if "WebsiteScraper" not in base_names:
+            if base_names - {"object"}:
+                return None
+            continue
 
-        for obj in module.__dict__.values():
-            if (
-                isinstance(obj, type)
-                and issubclass(obj, WebsiteScraper)
-                and obj is not WebsiteScraper
+        meta = None
+        interval_seconds = None
+        for statement in node.body:
+            if not (
+                isinstance(statement, (ast.Assign, ast.AnnAssign))
+                and statement.value is not None
             ):
-                scrapers.append(obj)
+                continue
+            targets = (
+                statement.targets
+                if isinstance(statement, ast.Assign)
+                else [statement.target]
+            )
+            names = {target.id for target in targets if isinstance(target, ast.Name)}
+            try:
+                if "meta" in names:
+                    call = statement.value
+                    if not (
+                        isinstance(call, ast.Call)
+                        and isinstance(call.func, ast.Name)
+                        and call.func.id == "WebsiteMeta"
+                    ):
+                        return None
+                    meta = WebsiteMeta(
+                        *(ast.literal_eval(arg) for arg in call.args),
+                        **{
+                            keyword.arg: ast.literal_eval(keyword.value)
+                            for keyword in call.keywords
+                            if keyword.arg is not None
+                        },
+                    )
+                elif "interval_seconds" in names:
+                    interval_seconds = int(ast.literal_eval(statement.value))
+            except (TypeError, ValueError):
+                return None
+
+        if meta is None:
+            return None
+        specs.append(
+            ScraperSpec(
+                module_path=module_path,
+                class_name=node.name,
+                meta=meta,
+                interval_seconds=interval_seconds,
+            )
+        )
+
+    return specs or None
+
+
+def specs_from_module(module_path: Path, reload: bool = False) -> list[ScraperSpec]:
+    module = load_module(module_path, reload=reload)
+    specs: list[ScraperSpec] = []
+    for obj in module.__dict__.values():
+        if (
+            isinstance(obj, type)
+            and issubclass(obj, WebsiteScraper)
+            and obj is not WebsiteScraper
+            and obj.__module__ == module.__name__
+            and isinstance(getattr(obj, "meta", None), WebsiteMeta)
+        ):
+            specs.append(
+                ScraperSpec(
+                    module_path=module_path,
+                    class_name=obj.__name__,
+                    meta=obj.meta,
+                    interval_seconds=obj.__dict__.get("interval_seconds"),
+                    scraper_cls=obj,
+                )
+            )
+    return specs
+
+
+def discover_scrapers(websites_dir: Path | None = None) -> list[ScraperSpec]:
+    base_dir = websites_dir or Path(__file__).with_name("websites")
+    if not base_dir.exists():
+        return []
+
+    scrapers: list[ScraperSpec] = []
+    for module_path in sorted(base_dir.glob("*.py")):
+        if module_path.name == "__init__.py":
+            continue
+
+        specs = read_manifest(module_path)
+        if specs is None:
+            specs = specs_from_module(module_path)
+        scrapers.extend(specs)
 
     return scrapers
 
@@ -77,13 +891,18 @@ def load_config(config_path: Path | None = None) -> dict:
         return yaml.safe_load(handle) or {}
 
 
-def init() -> dict:
+def config_section(config: dict, name: str) -> dict:
+    section = config.get(name)
+    return section if isinstance(section, dict) else {}
+
+
+def init(scrapers: list[ScraperSpec] | None = None) -> dict:
     config = load_config()
-    db_path = Path(__file__).with_name("rss.sqlite")
 
-    connection = sqlite3.connect(db_path)
+    connection = sqlite3.connect(DB_PATH)
     try:
         cursor = connection.cursor()
+        cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
         cursor.execute(
             """
             CREATE TABLE IF NOT EXISTS websites (
@@ -114,10 +933,171 @@ def init() -> dict:
             ON news (website_id, link)
             """
         )
+        cursor.execute(
+            """
+            CREATE INDEX IF NOT EXISTS news_website_published
+            ON news (website_id, publication_date)
+            """
+        )
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS circuit_breakers (
+                name TEXT PRIMARY KEY,
+                state TEXT NOT NULL,
+                failures INTEGER NOT NULL DEFAULT 0,
+                open_until REAL NOT NULL DEFAULT 0,
+                last_error TEXT DEFAULT NULL,
+                updated_at TEXT NOT NULL
+            )
+            """
+        )
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS scraper_leases (
+                name TEXT PRIMARY KEY,
+                owner TEXT DEFAULT NULL,
+                expires_at REAL NOT NULL DEFAULT 0,
+                next_run_at REAL NOT NULL DEFAULT 0
+            )
+            """
+        )
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS enrichment_cache (
+                url TEXT PRIMARY KEY,
+                status INTEGER DEFAULT NULL,
+                summary TEXT DEFAULT NULL,
+                fetched_at TEXT NOT NULL
+            )
+            """
+        )
+        try:
+            create_search_index(cursor)
+        except sqlite3.OperationalError as exc:
+            print(f"Full-text search disabled: {exc}")
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS scraper_state (
+                name TEXT PRIMARY KEY,
+                last_run_at TEXT DEFAULT NULL,
+                max_published TEXT DEFAULT NULL
+            )
+            """
+        )
+        columns = {row[1] for row in cursor.execute("PRAGMA table_info(scraper_state)")}
+        if "max_published" not in columns:
+            cursor.execute("ALTER TABLE scraper_state ADD COLUMN max_published TEXT DEFAULT NULL")
+            cursor.execute(
+                """
+                INSERT INTO scraper_state (name, max_published)
+                SELECT websites.name, MAX(news.publication_date)
+                FROM news
+                JOIN websites ON websites.id = news.website_id
+                GROUP BY websites.name
+                ON CONFLICT (name) DO UPDATE SET max_published = excluded.max_published
+                """
+            )
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS websub_subscriptions (
+                topic TEXT NOT NULL,
+                callback TEXT NOT NULL,
+                secret TEXT DEFAULT NULL,
+                expires_at REAL NOT NULL,
+                created_at TEXT NOT NULL,
+                PRIMARY KEY (topic, callback)
+            )
+            """
+        )
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS sitemap_state (
+                name TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                etag TEXT DEFAULT NULL,
+                last_modified TEXT DEFAULT NULL,
+                checked_at TEXT NOT NULL
+            )
+            """
+        )
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS scraper_checkpoints (
+                name TEXT PRIMARY KEY,
+                cursor TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+            """
+        )
+
+        connection.commit()
+    finally:
+        connection.close()
+
+    register_websites(discover_scrapers() if scrapers is None else scrapers)
+    return config
+
+
+def create_search_index(cursor: sqlite3.Cursor) -> None:
+    cursor.execute(
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS news_fts USING fts5(
+            title,
+            description,
+            content='news',
+            content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+        )
+        """
+    )
+    cursor.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS news_fts_insert AFTER INSERT ON news BEGIN
+            INSERT INTO news_fts (rowid, title, description)
+            VALUES (new.id, new.title, new.description);
+        END
+        """
+    )
+    cursor.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS news_fts_delete AFTER DELETE ON news BEGIN
+            INSERT INTO news_fts (news_fts, rowid, title, description)
+            VALUES ('delete', old.id, old.title, old.description);
+        END
+        """
+    )
+    cursor.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS news_fts_update AFTER UPDATE ON news BEGIN
+            INSERT INTO news_fts (news_fts, rowid, title, description)
+            VALUES ('delete', old.id, old.title, old.description);
+            INSERT INTO news_fts (rowid, title, description)
+            VALUES (new.id, new.title, new.description);
+        END
+        """
+    )
+
+
+def rebuild_search_index() -> None:
+    connection = sqlite3.connect(DB_PATH)
+    try:
+        indexed = connection.execute("SELECT 1 FROM news_fts_docsize LIMIT 1").fetchone()
+        stored = connection.execute("SELECT 1 FROM news LIMIT 1").fetchone()
+        if indexed is None and stored is not None:
+            print("Building the search index")
+            connection.execute("INSERT INTO news_fts (news_fts) VALUES ('rebuild')")
+            connection.commit()
+    except sqlite3.OperationalError as exc:
+        print(f"Could not build the search index: {exc}")
+    finally:
+        connection.close()
+
 
-        scrapers = discover_scrapers()
-        for scraper_cls in scrapers:
-            meta = scraper_cls.meta
+def register_websites(scrapers: list[ScraperSpec]) -> None:
+    with sqlite3.connect(DB_PATH) as connection:
+        cursor = connection.cursor()
+        for spec in scrapers:
+            meta = spec.meta
             cursor.execute("SELECT id FROM websites WHERE name = ?", (meta.name,))
             if cursor.fetchone() is None:
                 cursor.execute(
@@ -127,12 +1107,83 @@ def init() -> dict:
                     """,
                     (meta.name, meta.title, meta.url, meta.description),
                 )
-
         connection.commit()
-    finally:
-        connection.close()
 
-    return config
+
+T = TypeVar("T")
+
+
+class Metrics:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._values: dict[str, dict[tuple[tuple[str, str], ...], float]] = {}
+
+    def incr(self, name: str, value: float = 1, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._values.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def set(self, name: str, value: float, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values.setdefault(name, {})[key] = value
+
+    def render(self) -> bytes:
+        lines: list[str] = []
+        with self._lock:
+            for name in sorted(self._values):
+                for labels, value in sorted(self._values[name].items()):
+                    label_text = ",".join(
+                        f'{key}="{label_value}"' for key, label_value in labels
+                    )
+                    series = f"{name}{{{label_text}}}" if label_text else name
+                    lines.append(f"{series} {value:g}")
+        return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+METRICS = Metrics()
+
+
+@dataclass(slots=True)
+class InFlightCall:
+    done: threading.Event
+    result: Any = None
+    error: BaseException | None = None
+
+
+class SingleFlight:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, InFlightCall] = {}
+
+    def do(
+        self, key: Hashable, function: Callable[..., T], *args: Any
+    ) -> tuple[T, bool]:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = InFlightCall(done=threading.Event())
+
+        if not leader:
+            call.done.wait()
+        else:
+            try:
+                call.result = function(*args)
+            except BaseException as exc:
+                call.error = exc
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+
+        if call.error is not None:
+            raise call.error
+        return call.result, not leader
+
+
+FEED_BUILDS = SingleFlight()
 
 
 def start_server(port: int, website_names: set[str]) -> None:
@@ -144,15 +1195,46 @@ def start_server(port: int, website_names: set[str]) -> None:
             if path.startswith("/"):
                 path = path[1:]
 
-            if path and path in website_names:
-                feed = build_rss_feed(path)
-                if feed is None:
-                    self.send_response(HTTPStatus.NOT_FOUND)
-                    self.end_headers()
-                    return
-
+            if path == "metrics":
+                body = METRICS.render()
+                self.send_response(HTTPStatus.OK)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                return
+
+            if path == "status":
+                body = json.dumps({"scrapers": scraper_status()}, indent=2).encode("utf-8")
+                self.send_response(HTTPStatus.OK)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                return
+
+            if path == "search":
+                self.send_search_feed()
+                return
+
+            if path and path in website_names:
+                METRICS.incr("feed_requests_total", feed=path)
+                if self.send_exported_feed(path):
+                    return
+
+                feed, shared = FEED_BUILDS.do(("feed", path), build_rss_feed, path)
+                if shared:
+                    METRICS.incr("feed_requests_coalesced_total", feed=path)
+                else:
+                    METRICS.incr("feed_builds_total", feed=path)
+                if feed is None:
+                    self.send_response(HTTPStatus.NOT_FOUND)
+                    self.end_headers()
+                    return
+
                 self.send_response(HTTPStatus.OK)
                 self.send_header("Content-Type", "application/rss+xml; charset=utf-8")
+                self.send_hub_links(path)
                 self.end_headers()
                 self.wfile.write(feed)
                 return
@@ -160,16 +1242,169 @@ def start_server(port: int, website_names: set[str]) -> None:
             self.send_response(HTTPStatus.NOT_FOUND)
             self.end_headers()
 
+        def do_POST(self) -> None:
+            path = self.path.split("?", 1)[0].strip("/")
+            if path != "hub" or HUB is None:
+                self.send_response(HTTPStatus.NOT_FOUND)
+                self.end_headers()
+                return
+
+            try:
+                length = int(self.headers.get("Content-Length") or 0)
+            except ValueError:
+                length = 0
+            body = self.rfile.read(min(length, 64 * 1024)).decode("utf-8", "replace")
+            error = HUB.request(parse_qs(body), website_names)
+            message = (error or "").encode("utf-8")
+            self.send_response(HTTPStatus.BAD_REQUEST if error else HTTPStatus.ACCEPTED)
+            self.send_header("Content-Type", "text/plain; charset=utf-8")
+            self.send_header("Content-Length", str(len(message)))
+            self.end_headers()
+            self.wfile.write(message)
+
+        def send_hub_links(self, website_name: str) -> None:
+            if HUB is not None:
+                links = HUB.feed_links(website_name)
+                self.send_header(
+                    "Link", ", ".join(f'<{href}>; rel="{rel}"' for rel, href in links)
+                )
+
+        def send_search_feed(self) -> None:
+            params = parse_qs(urlsplit(self.path).query)
+            query = (params.get("q") or [""])[0].strip()
+            try:
+                limit = min(max(int((params.get("limit") or ["50"])[0]), 1), 500)
+                page = max(int((params.get("page") or ["1"])[0]), 1)
+            except ValueError:
+                query = ""
+            if not query:
+                self.send_response(HTTPStatus.BAD_REQUEST)
+                self.end_headers()
+                return
+
+            METRICS.incr("search_requests_total")
+            feed_url = "http://{}/search?{}".format(
+                self.headers.get("Host", "localhost"),
+                urlencode({"q": query, "limit": limit, "page": page}),
+            )
+            try:
+                feed, shared = FEED_BUILDS.do(
+                    ("search", query, limit, page),
+                    build_search_feed,
+                    query,
+                    limit,
+                    page,
+                    feed_url,
+                )
+            except sqlite3.Error as exc:
+                print(f"Search error for {query!r}: {exc}")
+                self.send_response(HTTPStatus.SERVICE_UNAVAILABLE)
+                self.end_headers()
+                return
+            if shared:
+                METRICS.incr("search_requests_coalesced_total")
+
+            self.send_response(HTTPStatus.OK)
+            self.send_header("Content-Type", "application/rss+xml; charset=utf-8")
+            self.send_header("Content-Length", str(len(feed)))
+            self.end_headers()
+            self.wfile.write(feed)
+
+        def send_exported_feed(self, website_name: str) -> bool:
+            if EXPORT_DIR is None:
+                return False
+
+            feed_path = EXPORT_DIR / website_name / "index.xml"
+            candidates: list[tuple[Path, str | None]] = [(feed_path, None)]
+            if "gzip" in self.headers.get("Accept-Encoding", ""):
+                candidates.insert(0, (feed_path.with_name("index.xml.gz"), "gzip"))
+
+            for candidate, content_encoding in candidates:
+                try:
+                    handle = candidate.open("rb")
+                except FileNotFoundError:
+                    continue
+
+                with handle:
+                    size = os.fstat(handle.fileno()).st_size
+                    self.send_response(HTTPStatus.OK)
+                    self.send_header("Content-Type", "application/rss+xml; charset=utf-8")
+                    self.send_header("Content-Length", str(size))
+                    self.send_header("Vary", "Accept-Encoding")
+                    self.send_hub_links(website_name)
+                    if content_encoding is not None:
+                        self.send_header("Content-Encoding", content_encoding)
+                    self.end_headers()
+                    self.connection.sendfile(handle)
+                return True
+
+            return False
+
         def log_message(self, format: str, *args: object) -> None:
             return
 
-    server = HTTPServer(("", port), RSSHandler)
+    class RSSServer(ThreadingHTTPServer):
+        daemon_threads = True
+        request_queue_size = 128
+
+    server = RSSServer(("", port), RSSHandler)
     server.serve_forever()
 
 
+def configure_export(config: dict) -> None:
+    global EXPORT_DIR
+
+    export_config = config_section(config, "export")
+    if not export_config.get("enabled", False):
+        EXPORT_DIR = None
+        return
+
+    directory = Path(export_config.get("directory") or "feeds")
+    if not directory.is_absolute():
+        directory = Path(__file__).parent / directory
+    directory.mkdir(parents=True, exist_ok=True)
+    EXPORT_DIR = directory
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, path)
+    except BaseException:
+        with suppress(FileNotFoundError):
+            os.unlink(tmp_name)
+        raise
+
+
+def export_feed(website_name: str) -> None:
+    if EXPORT_DIR is None:
+        return
+
+    feed = build_rss_feed(website_name)
+    if feed is None:
+        return
+
+    feed_dir = EXPORT_DIR / website_name
+    feed_dir.mkdir(exist_ok=True)
+    write_atomic(feed_dir / "index.xml.gz", gzip.compress(feed, 9, mtime=0))
+    write_atomic(feed_dir / "index.xml", feed)
+
+
+def export_feeds(website_names: set[str]) -> None:
+    for website_name in sorted(website_names):
+        try:
+            export_feed(website_name)
+        except Exception as exc:
+            print(f"Feed export error for {website_name}: {exc}")
+
+
 def build_rss_feed(website_name: str) -> bytes | None:
-    db_path = Path(__file__).with_name("rss.sqlite")
-    with sqlite3.connect(db_path) as connection:
+    with sqlite3.connect(DB_PATH) as connection:
         cursor = connection.cursor()
         cursor.execute(
             "SELECT id, name, title, url, description FROM websites WHERE name = ?",
@@ -191,11 +1426,24 @@ def build_rss_feed(website_name: str) -> bytes | None:
         )
         items = cursor.fetchall()
 
+    links = HUB.feed_links(name) if HUB is not None else ()
+    return render_rss(title, url, description, items, links)
+
+
+def render_rss(
+    title: str,
+    url: str,
+    description: str,
+    items: Sequence[tuple[str, str, str, str | None]],
+    links: Sequence[tuple[str, str]] = (),
+) -> bytes:
     rss = ET.Element("rss", version="2.0")
     channel = ET.SubElement(rss, "channel")
     ET.SubElement(channel, "title").text = title
     ET.SubElement(channel, "link").text = url
     ET.SubElement(channel, "description").text = description
+    for rel, href in links:
+        ET.SubElement(channel, f"{{{ATOM_NS}}}link", rel=rel, href=href)
 
     for link, item_title, publication_date, item_description in items:
         item = ET.SubElement(channel, "item")
@@ -218,145 +1466,1740 @@ def build_rss_feed(website_name: str) -> bytes | None:
     return ET.tostring(rss, encoding="utf-8", xml_declaration=True)
 
 
-def start_scrapers(
-    scrapers: list[type[WebsiteScraper]],
-    default_interval_seconds: int,
-    restart_delay_seconds: int = 180,
-) -> None:
-    def utc_now() -> datetime:
-        return datetime.now(timezone.utc)
-
-    def parse_utc(value: str) -> datetime:
-        parsed = datetime.fromisoformat(value)
-        if parsed.tzinfo is None:
-            return parsed.replace(tzinfo=timezone.utc)
-        return parsed.astimezone(timezone.utc)
-
-    def get_latest_publication_date(website_name: str) -> datetime:
-        db_path = Path(__file__).with_name("rss.sqlite")
-        with sqlite3.connect(db_path) as connection:
-            cursor = connection.cursor()
-            cursor.execute("SELECT id FROM websites WHERE name = ?", (website_name,))
-            row = cursor.fetchone()
-            if row is None:
-                return datetime(2000, 1, 1, tzinfo=timezone.utc)
-
-            website_id = row[0]
-            cursor.execute(
-                "SELECT publication_date FROM news WHERE website_id = ?"
-                " ORDER BY publication_date DESC LIMIT 1",
-                (website_id,),
+def fts_query(query: str) -> str:
+    return " ".join('"' + term.replace('"', '""') + '"' for term in query.split())
+
+
+SEARCH_CANDIDATES = 2000
+
+
+def search_news(query: str, limit: int = 50, page: int = 1) -> list[tuple]:
+    offset = (page - 1) * limit
+    # Only the most recent matches are ranked, so broad terms cost the same at any table size
+    sql = """
+        SELECT news.link, news.title, news.publication_date, news.description
+        FROM (
+            SELECT rowid, score
+            FROM (
+                SELECT rowid, bm25(news_fts, 10.0, 1.0) AS score
+                FROM news_fts
+                WHERE news_fts MATCH ?
+                ORDER BY rowid DESC
+                LIMIT ?
             )
-            row = cursor.fetchone()
-            if row is None or row[0] is None:
-                return datetime(2000, 1, 1, tzinfo=timezone.utc)
+            ORDER BY score, rowid DESC
+            LIMIT ? OFFSET ?
+        ) AS hits
+        JOIN news ON news.id = hits.rowid
+        ORDER BY hits.score, hits.rowid DESC
+    """
+    with sqlite3.connect(DB_PATH) as connection:
+        try:
+            return connection.execute(sql, (query, SEARCH_CANDIDATES, limit, offset)).fetchall()
+        except sqlite3.OperationalError:
+            if fts_query(query) == query:
+                raise
+            params = (fts_query(query), SEARCH_CANDIDATES, limit, offset)
+            return connection.execute(sql, params).fetchall()
 
-            return parse_utc(row[0])
 
-    def run_scraper(scraper_cls: type[WebsiteScraper]) -> None:
-        scraper = scraper_cls()
-        interval_seconds = (
-            scraper_cls.interval_seconds
-            if "interval_seconds" in scraper_cls.__dict__
-            else default_interval_seconds
+def build_search_feed(query: str, limit: int, page: int, feed_url: str) -> bytes:
+    items = search_news(query, limit, page)
+    return render_rss(
+        f"Search: {query}",
+        feed_url,
+        f"Articles matching {query!r} across every website",
+        items,
+    )
+
+
+def utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def parse_utc(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def get_latest_publication_date(website_name: str) -> datetime:
+    with sqlite3.connect(DB_PATH) as connection:
+        cursor = connection.cursor()
+        cursor.execute("SELECT id FROM websites WHERE name = ?", (website_name,))
+        row = cursor.fetchone()
+        if row is None:
+            return datetime(2000, 1, 1, tzinfo=timezone.utc)
+
+        website_id = row[0]
+        cursor.execute(
+            "SELECT publication_date FROM news WHERE website_id = ?"
+            " ORDER BY publication_date DESC LIMIT 1",
+            (website_id,),
         )
-        db_path = Path(__file__).with_name("rss.sqlite")
+        row = cursor.fetchone()
+        cursor.execute("SELECT max_published FROM scraper_state WHERE name = ?", (website_name,))
+        state = cursor.fetchone()
+        dates = [parse_utc(value[0]) for value in (row, state) if value is not None and value[0]]
+        if not dates:
+            return datetime(2000, 1, 1, tzinfo=timezone.utc)
+
+        return max(dates)
+
+
+def get_last_run(website_name: str) -> datetime | None:
+    with sqlite3.connect(DB_PATH) as connection:
+        row = connection.execute(
+            "SELECT last_run_at FROM scraper_state WHERE name = ?", (website_name,)
+        ).fetchone()
+    return parse_utc(row[0]) if row is not None and row[0] else None
+
+
+class KnownArticles:
+    def __init__(
+        self, enabled: bool = True, window_days: float = 30, max_items: int = 1000
+    ) -> None:
+        self.enabled = enabled
+        self.window = timedelta(days=window_days)
+        self.max_items = max(1, max_items)
+        self._links: dict[str, dict[str, str]] = {}
+        self._forgotten = 0
+        self._lock = threading.Lock()
+
+    def _load(self, website_name: str) -> dict[str, str]:
+        cutoff = get_latest_publication_date(website_name) - self.window
+        with sqlite3.connect(DB_PATH) as connection:
+            rows = connection.execute(
+                """
+                SELECT news.link, news.publication_date
+                FROM news
+                JOIN websites ON websites.id = news.website_id
+                WHERE websites.name = ? AND news.publication_date >= ?
+                ORDER BY news.publication_date DESC
+                LIMIT ?
+                """,
+                (website_name, cutoff.isoformat(), self.max_items),
+            ).fetchall()
+        return dict(rows)
+
+    def _site(self, website_name: str) -> dict[str, str]:
+        with self._lock:
+            links = self._links.get(website_name)
+            forgotten = self._forgotten
+        if links is not None:
+            return links
 
+        links = self._load(website_name)
+        with self._lock:
+            if self._forgotten != forgotten:
+                return links
+            return self._links.setdefault(website_name, links)
+
+    def contains(self, website_name: str, link: str) -> bool:
+        if not self.enabled:
+            return False
+        return link in self._site(website_name)
+
+    def filter(self, website_name: str, articles: Sequence[Article]) -> list[Article]:
+        if not self.enabled:
+            return list(articles)
+        links = self._site(website_name)
+        fresh = [article for article in articles if article.url not in links]
+        if len(fresh) != len(articles):
+            METRICS.incr(
+                "known_articles_skipped_total", len(articles) - len(fresh), feed=website_name
+            )
+        return fresh
+
+    def add(self, website_name: str, articles: Sequence[Article]) -> None:
+        if not self.enabled or not articles:
+            return
+        links = self._site(website_name)
+        with self._lock:
+            for article in articles:
+                published = article.published
+                if published.tzinfo is None:
+                    published = published.replace(tzinfo=timezone.utc)
+                links[article.url] = published.astimezone(timezone.utc).isoformat()
+
+            cutoff = (parse_utc(max(links.values())) - self.window).isoformat()
+            recent = sorted(
+                ((published, link) for link, published in links.items() if published >= cutoff),
+                reverse=True,
+            )[: self.max_items]
+            if len(recent) != len(links):
+                links.clear()
+                links.update((link, published) for published, link in recent)
+
+    def forget(self, website_name: str | None = None) -> None:
+        with self._lock:
+            self._forgotten += 1
+            if website_name is None:
+                self._links.clear()
+            else:
+                self._links.pop(website_name, None)
+
+
+KNOWN_ARTICLES = KnownArticles()
+
+
+def configure_known_articles(config: dict) -> None:
+    global KNOWN_ARTICLES
+
+    known_config = config_section(config, "known_articles")
+    KNOWN_ARTICLES = KnownArticles(
+        enabled=bool(known_config.get("enabled", True)),
+        window_days=float(known_config.get("window_days", 30)),
+        max_items=int(known_config.get("max_items", 1000)),
+    )
+
+
+def store_articles(
+    connection: sqlite3.Connection,
+    website_name: str,
+    articles: Sequence[Article],
+    run_at: datetime | None = None,
+) -> int:
+    cursor = connection.cursor()
+    inserted = 0
+    max_published: str | None = None
+    if articles:
+        cursor.execute("SELECT id FROM websites WHERE name = ?", (website_name,))
+        row = cursor.fetchone()
+        if row is None:
+            raise RuntimeError(f"Website {website_name} not found in database")
+
+        website_id = row[0]
+        for article in articles:
+            published = article.published
+            if published.tzinfo is None:
+                published = published.replace(tzinfo=timezone.utc)
+            published = published.astimezone(timezone.utc)
+            cursor.execute(
+                """
+                INSERT OR IGNORE INTO news
+                    (website_id, link, title, publication_date, description)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (
+                    website_id,
+                    article.url,
+                    article.title,
+                    published.isoformat(),
+                    article.summary,
+                ),
+            )
+            inserted += cursor.rowcount
+            max_published = max(max_published or "", published.isoformat())
+
+    cursor.execute(
+        """
+        INSERT INTO scraper_state (name, last_run_at, max_published) VALUES (?, ?, ?)
+        ON CONFLICT (name) DO UPDATE SET
+            last_run_at = excluded.last_run_at,
+            max_published = NULLIF(
+                MAX(
+                    COALESCE(scraper_state.max_published, ''),
+                    COALESCE(excluded.max_published, '')
+                ),
+                ''
+            )
+        """,
+        (website_name, (run_at or utc_now()).isoformat(), max_published),
+    )
+    return inserted
+
+
+def iter_articles(source: ArticleSource, deadline: float | None = None) -> Iterator[Article]:
+    def bounded(awaitable: Any) -> Any:
+        if deadline is None:
+            return awaitable
+        return asyncio.wait_for(awaitable, max(deadline - time.monotonic(), 0))
+
+    if isinstance(source, CoroutineType):
+        try:
+            source = asyncio.run(bounded(source))
+        except TimeoutError as exc:
+            if deadline is None or time.monotonic() < deadline:
+                raise
+            raise DeadlineExceeded("scrape deadline exceeded") from exc
+    if not hasattr(source, "__aiter__"):
+        if deadline is None or not isinstance(source, Iterator):
+            yield from source
+            return
+        for article in source:
+            yield article
+            if time.monotonic() >= deadline:
+                raise DeadlineExceeded("scrape deadline exceeded")
+        return
+
+    iterator = source.__aiter__()
+    loop = asyncio.new_event_loop()
+    try:
         while True:
             try:
-                since = get_latest_publication_date(scraper.meta.name)
-                articles = scraper.get_new_articles(since)
-                if articles:
-                    with sqlite3.connect(db_path) as connection:
-                        cursor = connection.cursor()
-                        before_changes = connection.total_changes
-                        cursor.execute(
-                            "SELECT id FROM websites WHERE name = ?",
-                            (scraper.meta.name,),
-                        )
-                        row = cursor.fetchone()
-                        if row is None:
-                            raise RuntimeError(
-                                f"Website {scraper.meta.name} not found in database"
-                            )
-
-                        website_id = row[0]
-                        for article in articles:
-                            published = article.published
-                            if published.tzinfo is None:
-                                published = published.replace(tzinfo=timezone.utc)
-                            published = published.astimezone(timezone.utc)
-                            cursor.execute(
-                                """
-                                INSERT OR IGNORE INTO news
-                                    (website_id, link, title, publication_date, description)
-                                VALUES (?, ?, ?, ?, ?)
-                                """,
-                                (
-                                    website_id,
-                                    article.url,
-                                    article.title,
-                                    published.isoformat(),
-                                    article.summary,
-                                ),
-                            )
-                        connection.commit()
-                        inserted = connection.total_changes - before_changes
-                        if inserted:
-                            print(
-                                f"Inserted {inserted} new articles for"
-                                f" {scraper.meta.name}"
-                            )
-            except Exception as exc:
-                print(f"Scraper error for {scraper_cls.__name__}: {exc}")
-            time.sleep(interval_seconds)
+                article = loop.run_until_complete(bounded(iterator.__anext__()))
+            except StopAsyncIteration:
+                return
+            except TimeoutError as exc:
+                if deadline is None or time.monotonic() < deadline:
+                    raise
+                raise DeadlineExceeded("scrape deadline exceeded") from exc
+            yield article
+    finally:
+        aclose = getattr(iterator, "aclose", None)
+        if aclose is not None:
+            with suppress(Exception):
+                loop.run_until_complete(aclose())
+        loop.close()
+
+
+def load_checkpoint(website_name: str) -> Any:
+    with sqlite3.connect(DB_PATH) as connection:
+        row = connection.execute(
+            "SELECT cursor FROM scraper_checkpoints WHERE name = ?", (website_name,)
+        ).fetchone()
+    return json.loads(row[0]) if row is not None else None
+
+
+def save_checkpoint(connection: sqlite3.Connection, website_name: str, cursor: Any) -> None:
+    if cursor is None:
+        connection.execute("DELETE FROM scraper_checkpoints WHERE name = ?", (website_name,))
+        return
+    connection.execute(
+        """
+        INSERT INTO scraper_checkpoints (name, cursor, updated_at) VALUES (?, ?, ?)
+        ON CONFLICT (name) DO UPDATE SET
+            cursor = excluded.cursor,
+            updated_at = excluded.updated_at
+        """,
+        (website_name, json.dumps(cursor), utc_now().isoformat()),
+    )
+
+
+@dataclass(slots=True)
+class SitemapCheck:
+    changed: bool = True
+    urls: list[str] | None = None
+    etag: str | None = None
+    last_modified: str | None = None
+
+
+def parse_lastmod(value: str) -> tuple[datetime, bool] | None:
+    value = value.strip()
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc), len(value) == 10
+
+
+def parse_sitemap(source: Any, since: datetime) -> tuple[list[str], int]:
+    changed: list[str] = []
+    dated = 0
+    loc: str | None = None
+    lastmod: str | None = None
+    for _, element in ET.iterparse(source, events=("end",)):
+        tag = element.tag.rsplit("}", 1)[-1]
+        if tag == "loc":
+            loc = (element.text or "").strip()
+        elif tag == "lastmod":
+            lastmod = element.text or ""
+        elif tag in ("url", "sitemap"):
+            parsed = parse_lastmod(lastmod) if lastmod else None
+            if parsed is not None:
+                dated += 1
+                modified, date_only = parsed
+                if loc and (modified.date() >= since.date() if date_only else modified > since):
+                    changed.append(loc)
+            loc = lastmod = None
+            element.clear()
+    return changed, dated
+
+
+def check_sitemap(scraper: WebsiteScraper, since: datetime) -> SitemapCheck:
+    name = scraper.meta.name
+    url = scraper.sitemap_url
+    with sqlite3.connect(DB_PATH) as connection:
+        row = connection.execute(
+            "SELECT url, etag, last_modified FROM sitemap_state WHERE name = ?", (name,)
+        ).fetchone()
+    headers = {}
+    if row is not None and row[0] == url:
+        if row[1]:
+            headers["If-None-Match"] = row[1]
+        if row[2]:
+            headers["If-Modified-Since"] = row[2]
+
+    try:
+        response = FETCHER.request(
+            "GET", url, deadline=scraper.deadline, headers=headers, timeout=30
+        )
+        if response.status_code == HTTPStatus.NOT_MODIFIED:
+            return SitemapCheck(changed=False, etag=row[1], last_modified=row[2])
+        if response.status_code != HTTPStatus.OK:
+            print(f"HTTP {response.status_code} when fetching sitemap {url}")
+            return SitemapCheck()
+        changed, dated = parse_sitemap(io.BytesIO(response.content), since)
+    except Exception as exc:
+        print(f"Sitemap check failed for {name}: {exc}")
+        return SitemapCheck()
+
+    return SitemapCheck(
+        changed=bool(changed) or not dated,
+        urls=changed if dated else None,
+        etag=response.headers.get("ETag"),
+        last_modified=response.headers.get("Last-Modified"),
+    )
+
+
+def save_sitemap_state(
+    connection: sqlite3.Connection, scraper: WebsiteScraper, check: SitemapCheck
+) -> None:
+    connection.execute(
+        """
+        INSERT INTO sitemap_state (name, url, etag, last_modified, checked_at)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT (name) DO UPDATE SET
+            url = excluded.url,
+            etag = excluded.etag,
+            last_modified = excluded.last_modified,
+            checked_at = excluded.checked_at
+        """,
+        (
+            scraper.meta.name,
+            scraper.sitemap_url,
+            check.etag,
+            check.last_modified,
+            utc_now().isoformat(),
+        ),
+    )
+
+
+DEFAULT_DEADLINE_SECONDS: float | None = None
+SITE_DEADLINE_SECONDS: dict[str, float] = {}
+
+
+def configure_deadlines(config: dict) -> None:
+    global DEFAULT_DEADLINE_SECONDS, SITE_DEADLINE_SECONDS
+
+    deadline_config = config_section(config, "deadline")
+    DEFAULT_DEADLINE_SECONDS = float(deadline_config.get("default_seconds", 600)) or None
+    SITE_DEADLINE_SECONDS = {
+        name: float(seconds) for name, seconds in (deadline_config.get("sites") or {}).items()
+    }
+
+
+def deadline_for(scraper: WebsiteScraper) -> float | None:
+    seconds = SITE_DEADLINE_SECONDS.get(scraper.meta.name)
+    if seconds is None:
+        seconds = scraper.deadline_seconds
+    if seconds is None:
+        seconds = DEFAULT_DEADLINE_SECONDS
+    return seconds or None
 
-    def build_thread(scraper_cls: type[WebsiteScraper]) -> threading.Thread:
-        return threading.Thread(target=run_scraper, args=(scraper_cls,), daemon=True)
 
-    threads: dict[type[WebsiteScraper], threading.Thread] = {}
-    restart_at: dict[type[WebsiteScraper], float | None] = {}
+@dataclass(slots=True)
+class ScrapeResult:
+    found: int = 0
+    inserted: int = 0
+    error: Exception | None = None
 
-    for scraper_cls in scrapers:
-        thread = build_thread(scraper_cls)
-        threads[scraper_cls] = thread
-        restart_at[scraper_cls] = None
-        thread.start()
 
-    def monitor_threads() -> None:
+def persist_articles(scraper: WebsiteScraper, run_at: datetime | None = None) -> ScrapeResult:
+    name = scraper.meta.name
+    chunk_size = max(1, scraper.chunk_size)
+    result = ScrapeResult()
+    started = time.monotonic()
+    scraper.fetch_errors.clear()
+    scraper.origins.clear()
+    scraper.cursor = load_checkpoint(name)
+    scraper.changed_urls = None
+    deadline_seconds = deadline_for(scraper)
+    scraper.deadline = time.monotonic() + deadline_seconds if deadline_seconds else None
+    since = get_latest_publication_date(name)
+    sitemap = (
+        check_sitemap(scraper, since)
+        if scraper.sitemap_url and scraper.cursor is None
+        else None
+    )
+
+    connection = sqlite3.connect(DB_PATH)
+
+    def flush(chunk: list[Article], done: bool = False) -> None:
+        fresh = KNOWN_ARTICLES.filter(name, chunk)
+        inserted = store_articles(connection, name, fresh, run_at=run_at)
+        save_checkpoint(connection, name, scraper.cursor)
+        if done and sitemap is not None:
+            save_sitemap_state(connection, scraper, sitemap)
+        connection.commit()
+        KNOWN_ARTICLES.add(name, fresh)
+        result.found += len(fresh)
+        result.inserted += inserted
+
+    if sitemap is not None and not sitemap.changed:
+        METRICS.incr("sitemap_skips_total", feed=name)
+        try:
+            flush([], done=True)
+        finally:
+            connection.close()
+        return result
+
+    chunk: list[Article] = []
+    articles: Iterator[Article] | None = None
+    try:
+        if sitemap is not None:
+            scraper.changed_urls = sitemap.urls
+        articles = iter_articles(scraper.get_new_articles(since), scraper.deadline)
+        for article in articles:
+            chunk.append(article)
+            if len(chunk) >= chunk_size:
+                flush(chunk)
+                chunk = []
+        flush(chunk, done=not scraper.fetch_errors)
+    except Exception as exc:
+        result.error = exc
+        connection.rollback()
+        if chunk:
+            with suppress(Exception):
+                flush(chunk)
+    finally:
+        if isinstance(articles, Generator):
+            articles.close()
+        connection.close()
+
+    METRICS.set("scrape_duration_seconds", time.monotonic() - started, feed=name)
+    if scraper.deadline is not None and time.monotonic() >= scraper.deadline:
+        METRICS.incr("scraper_timeouts_total", feed=name)
+        if result.error is None:
+            result.error = DeadlineExceeded(
+                f"{name}: scrape deadline of {deadline_seconds:g}s exceeded"
+            )
+    return result
+
+
+def run_scraper(scraper: WebsiteScraper) -> int:
+    result = persist_articles(scraper)
+    if result.inserted:
+        print(f"Inserted {result.inserted} new articles for {scraper.meta.name}")
+        export_feeds({scraper.meta.name})
+        if HUB is not None:
+            HUB.publish(scraper.meta.name)
+        if ENRICHER is not None:
+            ENRICHER.notify(scraper.meta.name)
+    if result.error is not None:
+        raise result.error
+    return result.inserted
+
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half_open"
+
+
+class CircuitBreakers:
+    def __init__(
+        self,
+        enabled: bool = True,
+        failure_threshold: int = 1,
+        max_backoff_seconds: float = 7 * 24 * 3600,
+        jitter: float = 0.2,
+    ) -> None:
+        self.enabled = enabled
+        self.failure_threshold = max(1, failure_threshold)
+        self.max_backoff_seconds = max_backoff_seconds
+        self.jitter = jitter
+
+    def _read(self, name: str) -> tuple[str, int, float]:
+        with sqlite3.connect(DB_PATH) as connection:
+            row = connection.execute(
+                "SELECT state, failures, open_until FROM circuit_breakers WHERE name = ?",
+                (name,),
+            ).fetchone()
+        return row if row is not None else (BREAKER_CLOSED, 0, 0.0)
+
+    def _write(
+        self,
+        name: str,
+        state: str,
+        failures: int,
+        open_until: float,
+        last_error: str | None,
+    ) -> None:
+        with sqlite3.connect(DB_PATH) as connection:
+            connection.execute(
+                """
+                INSERT INTO circuit_breakers
+                    (name, state, failures, open_until, last_error, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (name) DO UPDATE SET
+                    state = excluded.state,
+                    failures = excluded.failures,
+                    open_until = excluded.open_until,
+                    last_error = COALESCE(excluded.last_error, last_error),
+                    updated_at = excluded.updated_at
+                """,
+                (name, state, failures, open_until, last_error, utc_now().isoformat()),
+            )
+            connection.commit()
+        METRICS.set("circuit_breaker_open", int(state == BREAKER_OPEN), feed=name)
+
+    def retry_at(self, name: str) -> float:
+        if not self.enabled:
+            return 0.0
+        state, _, open_until = self._read(name)
+        return open_until if state == BREAKER_OPEN else 0.0
+
+    def allow(self, name: str) -> tuple[bool, float]:
+        if not self.enabled:
+            return True, 0.0
+        state, failures, open_until = self._read(name)
+        if state != BREAKER_OPEN:
+            return True, 0.0
+        if time.time() < open_until:
+            return False, open_until
+        self._write(name, BREAKER_HALF_OPEN, failures, open_until, None)
+        return True, 0.0
+
+    def record_success(self, name: str) -> None:
+        if not self.enabled:
+            return
+        state, failures, _ = self._read(name)
+        if state != BREAKER_CLOSED or failures:
+            print(f"Circuit closed for {name}")
+            self._write(name, BREAKER_CLOSED, 0, 0.0, None)
+
+    def record_failure(self, name: str, error: str, base_seconds: float) -> float:
+        METRICS.incr("scraper_failures_total", feed=name)
+        if not self.enabled:
+            return base_seconds
+
+        _, failures, _ = self._read(name)
+        failures += 1
+        if failures < self.failure_threshold:
+            self._write(name, BREAKER_CLOSED, failures, 0.0, error[:500])
+            return base_seconds
+
+        backoff = min(
+            base_seconds * 2 ** (failures - self.failure_threshold),
+            self.max_backoff_seconds,
+        )
+        delay = backoff * random.uniform(1 - self.jitter, 1 + self.jitter)
+        self._write(name, BREAKER_OPEN, failures, time.time() + delay, error[:500])
+        print(
+            f"Circuit open for {name} after {failures} failures,"
+            f" retrying in {delay:.0f} seconds"
+        )
+        return delay
+
+
+BREAKERS = CircuitBreakers()
+
+
+def configure_circuit_breakers(config: dict) -> None:
+    global BREAKERS
+
+    breaker_config = config_section(config, "circuit_breaker")
+    BREAKERS = CircuitBreakers(
+        enabled=bool(breaker_config.get("enabled", True)),
+        failure_threshold=int(breaker_config.get("failure_threshold", 1)),
+        max_backoff_seconds=float(breaker_config.get("max_backoff_seconds", 7 * 24 * 3600)),
+        jitter=float(breaker_config.get("jitter", 0.2)),
+    )
+
+
+def scraper_status() -> list[dict]:
+    with sqlite3.connect(DB_PATH) as connection:
+        rows = connection.execute(
+            """
+            SELECT
+                websites.name,
+                scraper_state.last_run_at,
+                circuit_breakers.state,
+                circuit_breakers.failures,
+                circuit_breakers.open_until,
+                circuit_breakers.last_error,
+                circuit_breakers.updated_at
+            FROM websites
+            LEFT JOIN scraper_state ON scraper_state.name = websites.name
+            LEFT JOIN circuit_breakers ON circuit_breakers.name = websites.name
+            ORDER BY websites.name
+            """
+        ).fetchall()
+
+    status = []
+    for name, last_run_at, state, failures, open_until, last_error, updated_at in rows:
+        status.append(
+            {
+                "name": name,
+                "last_run_at": last_run_at,
+                "circuit": state or BREAKER_CLOSED,
+                "failures": failures or 0,
+                "retry_at": (
+                    datetime.fromtimestamp(open_until, timezone.utc).isoformat()
+                    if state == BREAKER_OPEN
+                    else None
+                ),
+                "last_error": last_error,
+                "circuit_changed_at": updated_at,
+            }
+        )
+    return status
+
+
+class LeaseManager:
+    def __init__(self, lease_seconds: float = 900, poll_seconds: float = 60) -> None:
+        self.lease_seconds = lease_seconds
+        self.poll_seconds = poll_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+    def claim(self, name: str) -> tuple[bool, float]:
+        now = time.time()
+        with sqlite3.connect(DB_PATH) as connection:
+            connection.execute(
+                """
+                INSERT OR IGNORE INTO scraper_leases (name, owner, expires_at, next_run_at)
+                VALUES (?, NULL, 0, 0)
+                """,
+                (name,),
+            )
+            cursor = connection.execute(
+                """
+                UPDATE scraper_leases SET owner = ?, expires_at = ?
+                WHERE name = ?
+                    AND next_run_at <= ?
+                    AND (owner IS NULL OR owner = ? OR expires_at <= ?)
+                """,
+                (self.owner, now + self.lease_seconds, name, now, self.owner, now),
+            )
+            claimed = cursor.rowcount == 1
+            row = connection.execute(
+                "SELECT owner, expires_at, next_run_at FROM scraper_leases WHERE name = ?",
+                (name,),
+            ).fetchone()
+            connection.commit()
+
+        if claimed:
+            return True, now
+        owner, expires_at, next_run_at = row
+        if owner is not None and expires_at > now:
+            return False, max(next_run_at, expires_at)
+        return False, next_run_at
+
+    def release(self, name: str, next_run_at: float) -> None:
+        with sqlite3.connect(DB_PATH) as connection:
+            connection.execute(
+                """
+                UPDATE scraper_leases SET owner = NULL, expires_at = 0, next_run_at = ?
+                WHERE name = ? AND owner = ?
+                """,
+                (next_run_at, name, self.owner),
+            )
+            connection.commit()
+
+
+def start_leases(config: dict) -> LeaseManager | None:
+    cluster = config_section(config, "cluster")
+    if not cluster.get("enabled", False):
+        return None
+    leases = LeaseManager(
+        lease_seconds=float(cluster.get("lease_seconds", 900)),
+        poll_seconds=float(cluster.get("poll_seconds", 60)),
+    )
+    print(f"Cluster mode enabled, instance {leases.owner}")
+    return leases
+
+
+@dataclass(slots=True)
+class ScheduledScraper:
+    spec: ScraperSpec
+    next_run: float
+    stop: threading.Event
+    thread: threading.Thread | None = None
+    restart_at: float | None = None
+    previous: ScheduledScraper | None = None
+
+
+class ScraperScheduler:
+    def __init__(
+        self,
+        default_interval_seconds: int,
+        restart_delay_seconds: int = 180,
+        leases: LeaseManager | None = None,
+    ) -> None:
+        self.default_interval_seconds = default_interval_seconds
+        self.restart_delay_seconds = restart_delay_seconds
+        self.leases = leases
+        self._lock = threading.Lock()
+        self._scrapers: dict[str, ScheduledScraper] = {}
+        self._monitor: threading.Thread | None = None
+
+    def interval_for(self, spec: ScraperSpec) -> int:
+        return (
+            spec.interval_seconds
+            if spec.interval_seconds is not None
+            else self.default_interval_seconds
+        )
+
+    def names(self) -> set[str]:
+        with self._lock:
+            return set(self._scrapers)
+
+    def add(self, spec: ScraperSpec, next_run: float | None = None) -> None:
+        if next_run is None:
+            next_run = time.monotonic()
+            last_run = get_last_run(spec.meta.name)
+            if last_run is not None:
+                elapsed = (utc_now() - last_run).total_seconds()
+                next_run += max(0.0, self.interval_for(spec) - elapsed)
+            retry_in = BREAKERS.retry_at(spec.meta.name) - time.time()
+            next_run = max(next_run, time.monotonic() + retry_in)
+        entry = ScheduledScraper(spec=spec, next_run=next_run, stop=threading.Event())
+        with self._lock:
+            previous = self._scrapers.get(spec.meta.name)
+            if previous is not None:
+                previous.stop.set()
+                entry.previous = previous
+            self._scrapers[spec.meta.name] = entry
+            self._start_thread(entry)
+
+    def replace(self, spec: ScraperSpec) -> None:
+        with self._lock:
+            previous = self._scrapers.get(spec.meta.name)
+        self.add(spec, next_run=previous.next_run if previous is not None else None)
+
+    def remove(self, name: str) -> None:
+        with self._lock:
+            entry = self._scrapers.pop(name, None)
+        if entry is not None:
+            entry.stop.set()
+
+    def start(self, scrapers: list[ScraperSpec]) -> None:
+        for spec in scrapers:
+            self.add(spec)
+        if self._monitor is None:
+            self._monitor = threading.Thread(target=self._monitor_threads, daemon=True)
+            self._monitor.start()
+
+    def _start_thread(self, entry: ScheduledScraper) -> None:
+        entry.thread = threading.Thread(target=self._run, args=(entry,), daemon=True)
+        entry.restart_at = None
+        entry.thread.start()
+
+    def _run(self, entry: ScheduledScraper) -> None:
+        spec = entry.spec
+        interval_seconds = self.interval_for(spec)
+        previous, entry.previous = entry.previous, None
+        if previous is not None and previous.thread is not None:
+            previous.thread.join()
+            entry.next_run = max(entry.next_run, previous.next_run)
+        try:
+            scraper = spec.load()()
+        except Exception as exc:
+            BREAKERS.record_failure(spec.meta.name, f"Load error: {exc}", interval_seconds)
+            raise
+
+        preconnect = True
+        while not entry.stop.is_set():
+            delay = entry.next_run - time.monotonic()
+            lead_seconds = FETCHER.preconnect_seconds
+            if preconnect and lead_seconds and delay > lead_seconds:
+                if entry.stop.wait(delay - lead_seconds):
+                    return
+                urls = set(scraper.origins) or {scraper.meta.url}
+                if scraper.sitemap_url:
+                    urls.add(scraper.sitemap_url)
+                FETCHER.preconnect(urls)
+                delay = entry.next_run - time.monotonic()
+            if delay > 0 and entry.stop.wait(delay):
+                return
+
+            if self.leases is not None:
+                claimed, next_run_at = self.leases.claim(spec.meta.name)
+                preconnect = claimed
+                if not claimed:
+                    wait_seconds = max(next_run_at - time.time(), 0.0)
+                    entry.next_run = time.monotonic() + min(
+                        max(wait_seconds, 1.0), self.leases.poll_seconds
+                    ) + random.uniform(0, 1)
+                    continue
+
+            allowed, retry_at = BREAKERS.allow(spec.meta.name)
+            if not allowed:
+                if self.leases is not None:
+                    self.leases.release(spec.meta.name, retry_at)
+                entry.next_run = time.monotonic() + max(retry_at - time.time(), 1.0)
+                continue
+
+            delay_seconds: float = interval_seconds
+            entry.next_run = time.monotonic() + delay_seconds
+            try:
+                try:
+                    run_scraper(scraper)
+                    failure = "; ".join(scraper.fetch_errors) or None
+                except Exception as exc:
+                    print(f"Scraper error for {spec.class_name}: {exc}")
+                    failure = str(exc) or type(exc).__name__
+
+                if failure is None:
+                    BREAKERS.record_success(spec.meta.name)
+                else:
+                    delay_seconds = BREAKERS.record_failure(
+                        spec.meta.name, failure, interval_seconds
+                    )
+            finally:
+                if self.leases is not None:
+                    self.leases.release(spec.meta.name, time.time() + delay_seconds)
+            entry.next_run = time.monotonic() + delay_seconds
+
+    def _monitor_threads(self) -> None:
         while True:
             now = time.monotonic()
-            for scraper_cls, thread in list(threads.items()):
-                if thread.is_alive():
-                    restart_at[scraper_cls] = None
+            with self._lock:
+                entries = list(self._scrapers.values())
+
+            for entry in entries:
+                if entry.thread is None or entry.thread.is_alive():
+                    entry.restart_at = None
+                    continue
+                if entry.stop.is_set():
                     continue
 
-                if restart_at[scraper_cls] is None:
-                    restart_at[scraper_cls] = now + restart_delay_seconds
+                if entry.restart_at is None:
+                    restart_delay = max(
+                        self.restart_delay_seconds,
+                        BREAKERS.retry_at(entry.spec.meta.name) - time.time(),
+                    )
+                    entry.restart_at = now + restart_delay
                     print(
                         "Scraper thread for"
-                        f" {scraper_cls.__name__} stopped, restarting in"
-                        f" {restart_delay_seconds} seconds"
+                        f" {entry.spec.class_name} stopped, restarting in"
+                        f" {restart_delay:.0f} seconds"
                     )
                     continue
 
-                restart_time = restart_at[scraper_cls]
-                if restart_time is not None and now >= restart_time:
-                    new_thread = build_thread(scraper_cls)
-                    threads[scraper_cls] = new_thread
-                    restart_at[scraper_cls] = None
-                    new_thread.start()
+                if now >= entry.restart_at:
+                    with self._lock:
+                        if self._scrapers.get(entry.spec.meta.name) is entry:
+                            self._start_thread(entry)
 
             time.sleep(5)
 
-    monitor_thread = threading.Thread(target=monitor_threads, daemon=True)
-    monitor_thread.start()
 
+def start_scrapers(
+    scrapers: list[ScraperSpec],
+    default_interval_seconds: int,
+    restart_delay_seconds: int = 180,
+    leases: LeaseManager | None = None,
+) -> ScraperScheduler:
+    scheduler = ScraperScheduler(default_interval_seconds, restart_delay_seconds, leases)
+    scheduler.start(scrapers)
+    return scheduler
+
+
+def watch_scrapers(
+    scheduler: ScraperScheduler,
+    scrapers: list[ScraperSpec],
+    website_names: set[str],
+    websites_dir: Path | None = None,
+    poll_seconds: float = 5,
+) -> threading.Thread:
+    base_dir = websites_dir or Path(__file__).with_name("websites")
+
+    def snapshot() -> dict[Path, tuple[int, int]]:
+        modules: dict[Path, tuple[int, int]] = {}
+        for module_path in base_dir.glob("*.py"):
+            if module_path.name == "__init__.py":
+                continue
+            try:
+                stat = module_path.stat()
+            except OSError:
+                continue
+            modules[module_path] = (stat.st_mtime_ns, stat.st_size)
+        return modules
+
+    module_names: dict[Path, set[str]] = {}
+    for spec in scrapers:
+        module_names.setdefault(spec.module_path, set()).add(spec.meta.name)
+
+    def reload_module(module_path: Path, exists: bool) -> None:
+        try:
+            specs = specs_from_module(module_path, reload=True) if exists else []
+        except Exception as exc:
+            print(f"Failed to reload {module_path.name}, keeping previous version: {exc}")
+            return
+
+        previous_names = module_names.pop(module_path, set())
+        current = {spec.meta.name: spec for spec in specs}
+        if current:
+            module_names[module_path] = set(current)
+
+        for name in previous_names - set(current):
+            scheduler.remove(name)
+            website_names.discard(name)
+            print(f"Stopped scraper {name}")
+
+        new_specs = [spec for name, spec in current.items() if name not in previous_names]
+        register_websites(new_specs)
+        for name, spec in current.items():
+            if name in previous_names:
+                scheduler.replace(spec)
+                print(f"Reloaded scraper {name}")
+            else:
+                scheduler.add(spec)
+                website_names.add(name)
+                print(f"Started scraper {name}")
+
+    def watch() -> None:
+        known = snapshot()
+        while True:
+            time.sleep(poll_seconds)
+            current = snapshot()
+            for module_path in sorted(set(known) | set(current)):
+                if known.get(module_path) != current.get(module_path):
+                    reload_module(module_path, module_path in current)
+            known = current
+
+    thread = threading.Thread(target=watch, daemon=True)
+    thread.start()
+    return thread
+
+
+def extract_summary(soup: BeautifulSoup, max_chars: int) -> str | None:
+    for selector in (
+        "meta[property='og:description']",
+        "meta[name='description']",
+        "meta[name='twitter:description']",
+    ):
+        tag = soup.select_one(selector)
+        content = tag.get("content") if tag is not None else None
+        if isinstance(content, str) and content.strip():
+            return content.strip()[:max_chars]
+
+    container = soup.select_one("article") or soup.select_one("main") or soup.body
+    if container is None:
+        return None
+
+    text = ""
+    for paragraph in container.find_all("p"):
+        paragraph_text = paragraph.get_text(" ", strip=True)
+        if not paragraph_text:
+            continue
+        text = f"{text} {paragraph_text}".strip()
+        if len(text) >= max_chars:
+            break
+
+    if not text:
+        return None
+    if len(text) > max_chars:
+        text = text[:max_chars].rsplit(" ", 1)[0] + "…"
+    return text
+
+
+class Enricher:
+    def __init__(
+        self,
+        workers: int = 4,
+        per_host: int = 1,
+        max_chars: int = 500,
+        max_age_days: float = 30,
+        sites: set[str] | None = None,
+    ) -> None:
+        self.workers = workers
+        self.per_host = per_host
+        self.max_chars = max_chars
+        self.max_age_days = max_age_days
+        self.sites = sites
+        self._queue: queue.Queue[tuple[str, str, int | None]] = queue.Queue()
+        self._lock = threading.Lock()
+        self._pending: set[int] = set()
+        self._host_slots: dict[str, threading.BoundedSemaphore] = {}
+        self._dirty: set[str] = set()
+        self._threads: list[threading.Thread] = []
+
+    def start(self) -> None:
+        for _ in range(self.workers):
+            thread = threading.Thread(target=self._work, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def notify(self, website_name: str) -> None:
+        if self.sites is None or website_name in self.sites:
+            self._queue.put((website_name, "", None))
+
+    def join(self) -> None:
+        self._queue.join()
+
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        host = urlsplit(url).netloc
+        with self._lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = self._host_slots[host] = threading.BoundedSemaphore(self.per_host)
+            return slot
+
+    def _enqueue_pending(self, website_name: str) -> None:
+        cutoff = (utc_now() - timedelta(days=self.max_age_days)).isoformat()
+        with sqlite3.connect(DB_PATH) as connection:
+            rows = connection.execute(
+                """
+                SELECT news.id, news.link
+                FROM news
+                JOIN websites ON websites.id = news.website_id
+                WHERE websites.name = ?
+                    AND news.description IS NULL
+                    AND news.publication_date >= ?
+                    AND news.link NOT IN (
+                        SELECT url FROM enrichment_cache WHERE summary IS NULL
+                    )
+                """,
+                (website_name, cutoff),
+            ).fetchall()
+
+        for news_id, link in rows:
+            with self._lock:
+                if news_id in self._pending:
+                    continue
+                self._pending.add(news_id)
+            self._queue.put((website_name, link, news_id))
+
+    def _work(self) -> None:
+        while True:
+            website_name, url, news_id = self._queue.get()
+            try:
+                if news_id is None:
+                    self._enqueue_pending(website_name)
+                else:
+                    self._enrich(website_name, url, news_id)
+            except Exception as exc:
+                print(f"Enrichment error for {url or website_name}: {exc}")
+            finally:
+                if news_id is not None:
+                    with self._lock:
+                        self._pending.discard(news_id)
+                self._queue.task_done()
+                if self._queue.unfinished_tasks == 0:
+                    self._export_dirty()
+
+    def _enrich(self, website_name: str, url: str, news_id: int) -> None:
+        with sqlite3.connect(DB_PATH) as connection:
+            row = connection.execute(
+                "SELECT summary FROM enrichment_cache WHERE url = ?", (url,)
+            ).fetchone()
+
+        if row is not None:
+            summary = row[0]
+            METRICS.incr("enrichment_cache_hits_total", feed=website_name)
+        else:
+            with self._host_slot(url):
+                response = FETCHER.request("GET", url, timeout=30)
+            summary = (
+                extract_summary(parse_html(response), self.max_chars)
+                if response.status_code == 200
+                else None
+            )
+            METRICS.incr("enrichment_fetches_total", feed=website_name)
+            with sqlite3.connect(DB_PATH) as connection:
+                connection.execute(
+                    """
+                    INSERT OR REPLACE INTO enrichment_cache
+                        (url, status, summary, fetched_at)
+                    VALUES (?, ?, ?, ?)
+                    """,
+                    (url, response.status_code, summary, utc_now().isoformat()),
+                )
+                connection.commit()
+
+        if not summary:
+            return
+        with sqlite3.connect(DB_PATH) as connection:
+            cursor = connection.execute(
+                "UPDATE news SET description = ? WHERE id = ? AND description IS NULL",
+                (summary, news_id),
+            )
+            connection.commit()
+        if cursor.rowcount:
+            with self._lock:
+                self._dirty.add(website_name)
+
+    def _export_dirty(self) -> None:
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+        export_feeds(dirty)
+
+
+ENRICHER: Enricher | None = None
+
+
+def start_enrichment(config: dict) -> Enricher | None:
+    global ENRICHER
+
+    enrichment = config_section(config, "enrichment")
+    if not enrichment.get("enabled", False):
+        return None
+
+    sites = enrichment.get("sites")
+    ENRICHER = Enricher(
+        workers=int(enrichment.get("workers", 4)),
+        per_host=int(enrichment.get("per_host", 1)),
+        max_chars=int(enrichment.get("max_chars", 500)),
+        max_age_days=float(enrichment.get("max_age_days", 30)),
+        sites=set(sites) if sites else None,
+    )
+    ENRICHER.start()
+    return ENRICHER
+
+
+WEBSUB_MODES = ("subscribe", "unsubscribe")
+
+
+@dataclass(slots=True)
+class HubTask:
+    website_name: str
+    topic: str
+    callback: str
+    mode: str = "publish"
+    secret: str | None = None
+    lease_seconds: int = 0
+    body: bytes = b""
+    attempt: int = 1
+
+
+class WebSubHub:
+    def __init__(
+        self,
+        public_url: str,
+        workers: int = 2,
+        default_lease_seconds: int = 10 * 24 * 3600,
+        max_lease_seconds: int = 30 * 24 * 3600,
+        max_attempts: int = 6,
+        retry_seconds: float = 60,
+        timeout_seconds: float = 10,
+        drain_seconds: float = 120,
+    ) -> None:
+        self.public_url = public_url.rstrip("/")
+        self.hub_url = f"{self.public_url}/hub"
+        self.workers = workers
+        self.default_lease_seconds = default_lease_seconds
+        self.max_lease_seconds = max_lease_seconds
+        self.max_attempts = max(1, max_attempts)
+        self.retry_seconds = retry_seconds
+        self.timeout_seconds = timeout_seconds
+        self.drain_seconds = drain_seconds
+        self._queue: queue.Queue[HubTask] = queue.Queue()
+        self._pending = 0
+        self._idle = threading.Condition()
+
+    def start(self) -> None:
+        for _ in range(self.workers):
+            threading.Thread(target=self._work, daemon=True).start()
+
+    def join(self) -> int:
+        with self._idle:
+            self._idle.wait_for(lambda: not self._pending, self.drain_seconds)
+            return self._pending
+
+    def _put(self, task: HubTask) -> None:
+        self._track(1)
+        self._queue.put(task)
+
+    def _track(self, count: int) -> None:
+        with self._idle:
+            self._pending += count
+            if not self._pending:
+                self._idle.notify_all()
+
+    def topic_url(self, website_name: str) -> str:
+        return f"{self.public_url}/{website_name}/"
+
+    def feed_links(self, website_name: str) -> list[tuple[str, str]]:
+        return [("hub", self.hub_url), ("self", self.topic_url(website_name))]
+
+    def request(self, params: dict[str, list[str]], website_names: set[str]) -> str | None:
+        def param(name: str) -> str:
+            return (params.get(name) or [""])[0].strip()
+
+        mode = param("hub.mode")
+        callback = param("hub.callback")
+        website_name = urlsplit(param("hub.topic")).path.strip("/")
+        secret = param("hub.secret") or None
+        if mode not in WEBSUB_MODES:
+            return f"hub.mode must be one of {', '.join(WEBSUB_MODES)}"
+        if website_name not in website_names:
+            return "Unknown hub.topic"
+        if urlsplit(callback).scheme not in ("http", "https"):
+            return "hub.callback must be an http(s) URL"
+        if secret is not None and len(secret.encode("utf-8")) >= 200:
+            return "hub.secret must be shorter than 200 bytes"
+        try:
+            lease_seconds = int(param("hub.lease_seconds") or self.default_lease_seconds)
+        except ValueError:
+            return "hub.lease_seconds must be an integer"
+
+        self._put(
+            HubTask(
+                website_name=website_name,
+                topic=self.topic_url(website_name),
+                callback=callback,
+                mode=mode,
+                secret=secret,
+                lease_seconds=min(max(lease_seconds, 60), self.max_lease_seconds),
+            )
+        )
+        return None
+
+    def publish(self, website_name: str) -> None:
+        topic = self.topic_url(website_name)
+        with sqlite3.connect(DB_PATH) as connection:
+            connection.execute(
+                "DELETE FROM websub_subscriptions WHERE expires_at < ?", (time.time(),)
+            )
+            subscribers = connection.execute(
+                "SELECT callback, secret FROM websub_subscriptions WHERE topic = ?",
+                (topic,),
+            ).fetchall()
+            connection.commit()
+        METRICS.set("websub_subscribers", len(subscribers), feed=website_name)
+        if not subscribers:
+            return
+
+        body = build_rss_feed(website_name)
+        if body is None:
+            return
+        for callback, secret in subscribers:
+            self._put(HubTask(website_name, topic, callback, secret=secret, body=body))
+
+    def _work(self) -> None:
+        while True:
+            task = self._queue.get()
+            try:
+                if task.mode == "publish":
+                    self._deliver(task)
+                else:
+                    self._verify(task)
+            except Exception as exc:
+                print(f"WebSub error for {task.callback}: {exc}")
+            finally:
+                self._track(-1)
+
+    def _verify(self, task: HubTask) -> None:
+        challenge = uuid.uuid4().hex
+        query = urlencode(
+            {
+                "hub.mode": task.mode,
+                "hub.topic": task.topic,
+                "hub.challenge": challenge,
+                "hub.lease_seconds": task.lease_seconds,
+            }
+        )
+        separator = "&" if "?" in task.callback else "?"
+        try:
+            with urllib.request.urlopen(
+                f"{task.callback}{separator}{query}", timeout=self.timeout_seconds
+            ) as response:
+                verified = response.read().decode("utf-8", "replace").strip() == challenge
+        except (urllib.error.URLError, OSError) as exc:
+            print(f"WebSub {task.mode} of {task.callback} not verified: {exc}")
+            return
+        if not verified:
+            print(f"WebSub {task.mode} of {task.callback} not verified: challenge mismatch")
+            return
+
+        with sqlite3.connect(DB_PATH) as connection:
+            if task.mode == "subscribe":
+                connection.execute(
+                    """
+                    INSERT INTO websub_subscriptions
+                        (topic, callback, secret, expires_at, created_at)
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT (topic, callback) DO UPDATE SET
+                        secret = excluded.secret,
+                        expires_at = excluded.expires_at
+                    """,
+                    (
+                        task.topic,
+                        task.callback,
+                        task.secret,
+                        time.time() + task.lease_seconds,
+                        utc_now().isoformat(),
+                    ),
+                )
+            else:
+                connection.execute(
+                    "DELETE FROM websub_subscriptions WHERE topic = ? AND callback = ?",
+                    (task.topic, task.callback),
+                )
+            connection.commit()
+        print(f"WebSub {task.mode} of {task.callback} to {task.website_name} verified")
+
+    def _deliver(self, task: HubTask) -> None:
+        headers = {
+            "Content-Type": "application/rss+xml; charset=utf-8",
+            "Link": f'<{self.hub_url}>; rel="hub", <{task.topic}>; rel="self"',
+        }
+        if task.secret:
+            digest = hmac.new(task.secret.encode("utf-8"), task.body, hashlib.sha256)
+            headers["X-Hub-Signature"] = f"sha256={digest.hexdigest()}"
+
+        request = urllib.request.Request(
+            task.callback, data=task.body, headers=headers, method="POST"
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout_seconds) as response:
+                response.read()
+            METRICS.incr("websub_deliveries_total", feed=task.website_name)
+            return
+        except urllib.error.HTTPError as exc:
+            error = f"HTTP {exc.code}"
+            if exc.code == HTTPStatus.GONE:
+                with sqlite3.connect(DB_PATH) as connection:
+                    connection.execute(
+                        "DELETE FROM websub_subscriptions WHERE topic = ? AND callback = ?",
+                        (task.topic, task.callback),
+                    )
+                    connection.commit()
+                return
+        except (urllib.error.URLError, OSError) as exc:
+            error = str(exc)
+
+        METRICS.incr("websub_delivery_failures_total", feed=task.website_name)
+        if task.attempt >= self.max_attempts:
+            print(
+                f"WebSub delivery to {task.callback} dropped"
+                f" after {task.attempt} attempts: {error}"
+            )
+            return
+
+        delay = self.retry_seconds * 2 ** (task.attempt - 1)
+        task.attempt += 1
+        self._track(1)
+        timer = threading.Timer(delay, self._queue.put, args=(task,))
+        timer.daemon = True
+        timer.start()
+
+
+HUB: WebSubHub | None = None
+
+
+def start_websub(config: dict, port: int) -> WebSubHub | None:
+    global HUB
+
+    websub = config_section(config, "websub")
+    if not websub.get("enabled", False):
+        return None
+
+    HUB = WebSubHub(
+        public_url=websub.get("public_url") or f"http://localhost:{port}",
+        workers=int(websub.get("workers", 2)),
+        default_lease_seconds=int(websub.get("lease_seconds", 10 * 24 * 3600)),
+        max_lease_seconds=int(websub.get("max_lease_seconds", 30 * 24 * 3600)),
+        max_attempts=int(websub.get("max_attempts", 6)),
+        retry_seconds=float(websub.get("retry_seconds", 60)),
+        drain_seconds=float(websub.get("drain_seconds", 120)),
+    )
+    HUB.start()
+    return HUB
+
+
+def retention_limits(retention: dict, website_name: str) -> tuple[float | None, int | None]:
+    sites = retention.get("sites") if isinstance(retention.get("sites"), dict) else {}
+    site = sites.get(website_name) if isinstance(sites.get(website_name), dict) else {}
+    max_age_days = site.get("max_age_days", retention.get("max_age_days"))
+    max_items = site.get("max_items", retention.get("max_items"))
+    return (
+        float(max_age_days) if max_age_days else None,
+        int(max_items) if max_items else None,
+    )
+
+
+def delete_news_in_batches(
+    select_ids_sql: str, params: tuple, batch_size: int, pause_seconds: float
+) -> int:
+    deleted = 0
+    while True:
+        with sqlite3.connect(DB_PATH) as connection:
+            cursor = connection.execute(
+                f"DELETE FROM news WHERE id IN ({select_ids_sql})", params
+            )
+            connection.commit()
+        deleted += cursor.rowcount
+        if cursor.rowcount < batch_size:
+            return deleted
+        time.sleep(pause_seconds)
+
+
+def incremental_vacuum(pages: int = 256, pause_seconds: float = 0.05) -> None:
+    previous_free_pages = None
+    while True:
+        with sqlite3.connect(DB_PATH) as connection:
+            if connection.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+                return
+            free_pages = connection.execute("PRAGMA freelist_count").fetchone()[0]
+            if not free_pages or free_pages == previous_free_pages:
+                return
+            # execute() steps this pragma only once, freeing a single page.
+            connection.executescript(f"PRAGMA incremental_vacuum({int(pages)});")
+        previous_free_pages = free_pages
+        time.sleep(pause_seconds)
+
+
+def incremental_vacuum_enabled() -> bool:
+    with sqlite3.connect(DB_PATH) as connection:
+        return connection.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+
+
+def check_incremental_vacuum() -> None:
+    try:
+        if incremental_vacuum_enabled():
+            return
+    except sqlite3.Error as exc:
+        print(f"Could not check incremental vacuum: {exc}")
+        return
+    print(
+        "Incremental vacuum is not enabled on this database, so deleted articles do not"
+        " shrink the file. Run `python scrape2rss.py vacuum` once, with the server and"
+        " scrapers stopped, to enable it."
+    )
+
+
+def enable_incremental_vacuum() -> None:
+    if incremental_vacuum_enabled():
+        print("Incremental vacuum is already enabled")
+        return
+    with sqlite3.connect(DB_PATH) as connection:
+        print("Converting database to incremental auto-vacuum, this runs VACUUM once")
+        connection.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        connection.execute("VACUUM")
+
+
+def compact_news(retention: dict) -> int:
+    batch_size = int(retention.get("batch_size", 500))
+    pause_seconds = float(retention.get("pause_seconds", 0.05))
+    with sqlite3.connect(DB_PATH) as connection:
+        websites = connection.execute("SELECT id, name FROM websites").fetchall()
+
+    total_deleted = 0
+    for website_id, name in websites:
+        max_age_days, max_items = retention_limits(retention, name)
+        deleted = 0
+        if max_age_days is not None:
+            cutoff = (utc_now() - timedelta(days=max_age_days)).isoformat()
+            deleted += delete_news_in_batches(
+                "SELECT id FROM news WHERE website_id = ? AND publication_date < ?"
+                " LIMIT ?",
+                (website_id, cutoff, batch_size),
+                batch_size,
+                pause_seconds,
+            )
+        if max_items is not None:
+            deleted += delete_news_in_batches(
+                "SELECT id FROM news WHERE website_id = ?"
+                " ORDER BY publication_date DESC, id DESC LIMIT ? OFFSET ?",
+                (website_id, batch_size, max_items),
+                batch_size,
+                pause_seconds,
+            )
+
+        if deleted:
+            KNOWN_ARTICLES.forget(name)
+            METRICS.incr("news_rows_deleted_total", deleted, feed=name)
+            print(f"Deleted {deleted} old articles for {name}")
+            export_feeds({name})
+        total_deleted += deleted
+
+    incremental_vacuum(pause_seconds=pause_seconds)
+    return total_deleted
+
+
+def retention_enabled(retention: dict) -> bool:
+    if retention.get("max_age_days") or retention.get("max_items"):
+        return True
+    sites = retention.get("sites") if isinstance(retention.get("sites"), dict) else {}
+    return any(
+        isinstance(site, dict) and (site.get("max_age_days") or site.get("max_items"))
+        for site in sites.values()
+    )
+
+
+def start_compaction(retention: dict) -> threading.Thread:
+    interval_seconds = float(retention.get("interval_seconds", 3600))
+
+    def compact_forever() -> None:
+        check_incremental_vacuum()
+        while True:
+            try:
+                compact_news(retention)
+            except Exception as exc:
+                print(f"Compaction error: {exc}")
+            time.sleep(interval_seconds)
+
+    thread = threading.Thread(target=compact_forever, daemon=True)
+    thread.start()
+    return thread
+
+
+def scrape_once(
+    scrapers: list[ScraperSpec],
+    default_interval_seconds: int,
+    sites: list[str] | None = None,
+    workers: int = 4,
+    force: bool = False,
+    leases: LeaseManager | None = None,
+) -> bool:
+    started = time.perf_counter()
+    now = utc_now()
+    if sites:
+        unknown = set(sites) - {spec.meta.name for spec in scrapers}
+        if unknown:
+            raise SystemExit(f"Unknown site(s): {', '.join(sorted(unknown))}")
+        selected = [spec for spec in scrapers if spec.meta.name in sites]
+    else:
+        selected = list(scrapers)
+
+    due: list[ScraperSpec] = []
+    intervals: dict[str, int] = {}
+    for spec in selected:
+        interval_seconds = (
+            spec.interval_seconds
+            if spec.interval_seconds is not None
+            else default_interval_seconds
+        )
+        intervals[spec.meta.name] = interval_seconds
+        last_run = get_last_run(spec.meta.name)
+        if not (
+            force
+            or sites
+            or last_run is None
+            or (now - last_run).total_seconds() >= interval_seconds
+        ):
+            print(f"{spec.meta.name:<24} skipped (not due)")
+        elif leases is not None and not leases.claim(spec.meta.name)[0]:
+            print(f"{spec.meta.name:<24} skipped (leased or not due in the cluster)")
+        elif not force and not (allowed := BREAKERS.allow(spec.meta.name))[0]:
+            retry_at = datetime.fromtimestamp(allowed[1], timezone.utc)
+            print(f"{spec.meta.name:<24} skipped (circuit open until {retry_at.isoformat()})")
+            if leases is not None:
+                leases.release(spec.meta.name, allowed[1])
+        else:
+            due.append(spec)
+
+    def collect(spec: ScraperSpec) -> tuple[ScrapeResult, float, list[str]]:
+        collect_started = time.perf_counter()
+        scraper = spec.load()()
+        result = persist_articles(scraper, run_at=now)
+        return result, time.perf_counter() - collect_started, scraper.fetch_errors
+
+    results: dict[str, tuple[ScrapeResult, float]] = {}
+    failures: dict[str, str] = {}
+    pool_size = max(1, min(workers, len(due)))
+    if due:
+        with ThreadPoolExecutor(max_workers=pool_size) as executor:
+            futures = {executor.submit(collect, spec): spec for spec in due}
+            for future in as_completed(futures):
+                name = futures[future].meta.name
+                try:
+                    result, elapsed, fetch_errors = future.result()
+                except Exception as exc:
+                    failures[name] = str(exc) or type(exc).__name__
+                    continue
+                results[name] = (result, elapsed)
+                if result.error is not None:
+                    failures[name] = str(result.error) or type(result.error).__name__
+                elif fetch_errors:
+                    failures[name] = "; ".join(fetch_errors)
+
+    inserted = {name: result.inserted for name, (result, _) in results.items()}
+    for spec in due:
+        name = spec.meta.name
+        delay_seconds: float = intervals[name]
+        if name in failures:
+            delay_seconds = BREAKERS.record_failure(name, failures[name], delay_seconds)
+        else:
+            BREAKERS.record_success(name)
+        if leases is not None:
+            leases.release(name, time.time() + delay_seconds)
+    export_feeds({name for name, count in inserted.items() if count})
+    if HUB is not None:
+        for name, count in inserted.items():
+            if count:
+                HUB.publish(name)
+        pending = HUB.join()
+        if pending:
+            print(f"Exiting with {pending} WebSub deliveries still pending")
+    if ENRICHER is not None:
+        for name, count in inserted.items():
+            if count:
+                ENRICHER.notify(name)
+        ENRICHER.join()
+
+    for spec in due:
+        name = spec.meta.name
+        if name in failures:
+            print(f"{name:<24} error: {failures[name]}")
+        if name not in results:
+            continue
+        result, elapsed = results[name]
+        print(
+            f"{name:<24} {elapsed:7.2f}s  {result.found:>4} found"
+            f"  {inserted[name]:>4} inserted"
+        )
+    print(
+        f"Scraped {len(due) - len(failures)}/{len(due)} due sites with {pool_size} workers"
+        f" in {time.perf_counter() - started:.2f}s"
+    )
+    return not failures
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Expose RSS feeds for scraped websites")
+    commands = parser.add_subparsers(dest="command")
+    commands.add_parser("serve", help="Run the scrapers and the RSS server (default)")
+    scrape_parser = commands.add_parser(
+        "scrape", help="Run the scrapers without the RSS server"
+    )
+    scrape_parser.add_argument(
+        "--once", action="store_true", help="Scrape due sites concurrently and exit"
+    )
+    scrape_parser.add_argument(
+        "--site", action="append", help="Only scrape this site (repeatable)"
+    )
+    scrape_parser.add_argument("--workers", type=int, default=4)
+    scrape_parser.add_argument(
+        "--force", action="store_true", help="Scrape sites even if they are not due"
+    )
+    commands.add_parser(
+        "vacuum",
+        help="Convert the database to incremental auto-vacuum with a one-off VACUUM and exit",
+    )
+    args = parser.parse_args(argv)
 
-def main() -> None:
-    config = init()
     scrapers = discover_scrapers()
+    config = init(scrapers)
+    if args.command == "vacuum":
+        enable_incremental_vacuum()
+        return
+
+    configure_export(config)
+    configure_circuit_breakers(config)
+    port = int(config_section(config, "server").get("port") or 8082)
+    start_websub(config, port)
     website_names = {scraper.meta.name for scraper in scrapers}
+
+    server: threading.Thread | None = None
+    if args.command != "scrape":
+        server = threading.Thread(
+            target=start_server, args=(port, website_names), daemon=True
+        )
+        server.start()
+
+    rebuild_search_index()
+    configure_fetcher(config)
+    configure_known_articles(config)
+    configure_deadlines(config)
+    start_enrichment(config)
+    leases = start_leases(config)
     refresh_period = (
         config.get("server", {}).get("refresh_period")
         if isinstance(config.get("server"), dict)
@@ -365,13 +3208,51 @@ def main() -> None:
     default_interval_seconds = (
         int(refresh_period) * 60 if refresh_period else WebsiteScraper.interval_seconds
     )
-    start_scrapers(scrapers, default_interval_seconds)
-    port = (
-        config.get("server", {}).get("port")
-        if isinstance(config.get("server"), dict)
-        else None
-    )
-    start_server(int(port) if port else 8082, website_names)
+
+    if args.command == "scrape" and args.once:
+        ok = scrape_once(
+            scrapers,
+            default_interval_seconds,
+            sites=args.site,
+            workers=args.workers,
+            force=args.force,
+            leases=leases,
+        )
+        retention = config_section(config, "retention")
+        if retention_enabled(retention):
+            check_incremental_vacuum()
+            compact_news(retention)
+        sys.exit(0 if ok else 1)
+
+    if args.command == "scrape" and args.site:
+        scrapers = [spec for spec in scrapers if spec.meta.name in args.site]
+
+    scheduler = start_scrapers(scrapers, default_interval_seconds, leases=leases)
+    hot_reload = config_section(config, "hot_reload")
+    if hot_reload.get("enabled", True) and not (args.command == "scrape" and args.site):
+        watch_scrapers(
+            scheduler,
+            scrapers,
+            website_names,
+            poll_seconds=float(hot_reload.get("poll_seconds", 5)),
+        )
+
+    if EXPORT_DIR is not None:
+        threading.Thread(target=export_feeds, args=(website_names,), daemon=True).start()
+
+    if ENRICHER is not None:
+        for name in sorted(website_names):
+            ENRICHER.notify(name)
+
+    retention = config_section(config, "retention")
+    if retention_enabled(retention):
+        start_compaction(retention)
+
+    if server is None:
+        threading.Event().wait()
+    else:
+        server.join()
+        sys.exit("RSS server stopped")
 
 
 if __name__ == "__main__":
@@ -1,9 +1,8 @@
 from datetime import datetime, timezone
 
 import requests
-from bs4 import BeautifulSoup
 
-from scrape2rss import Article, WebsiteMeta, WebsiteScraper
+from scrape2rss import Article, WebsiteMeta, WebsiteScraper, parse_html
 
 
 class AnthropicEngineeringNews(WebsiteScraper):
@@ -23,14 +22,14 @@ class AnthropicEngineeringNews(WebsiteScraper):
         articles: list[Article] = []
 
         try:
-            response = requests.get(self.ENGINEERING_URL, timeout=30)
+            response = self.fetch(self.ENGINEERING_URL, timeout=30)
             if response.status_code != 200:
                 print(
                     f"HTTP {response.status_code} when fetching {self.ENGINEERING_URL}"
                 )
                 return articles
 
-            soup = BeautifulSoup(response.text, "html.parser")
+            soup = parse_html(response)
 
             for item in soup.select("article a[href^='/engineering/']"):
                 title_tag = item.select_one("h2, h3")
@@ -1,9 +1,8 @@
 from datetime import datetime, timezone
 
 import requests
-from bs4 import BeautifulSoup
 
-from scrape2rss import Article, WebsiteMeta, WebsiteScraper
+from scrape2rss import Article, WebsiteMeta, WebsiteScraper, parse_html
 
 
 class AnthropicResearchNews(WebsiteScraper):
@@ -23,12 +22,12 @@ class AnthropicResearchNews(WebsiteScraper):
         articles: list[Article] = []
 
         try:
-            response = requests.get(self.RESEARCH_URL, timeout=30)
+            response = self.fetch(self.RESEARCH_URL, timeout=30)
             if response.status_code != 200:
                 print(f"HTTP {response.status_code} when fetching {self.RESEARCH_URL}")
                 return articles
 
-            soup = BeautifulSoup(response.text, "html.parser")
+            soup = parse_html(response)
             seen_ids: set[str] = set()
 
             for item in soup.select(
@@ -1,9 +1,8 @@
 from datetime import datetime, timezone
 
 import requests
-from bs4 import BeautifulSoup
 
-from scrape2rss import Article, WebsiteMeta, WebsiteScraper
+from scrape2rss import Article, WebsiteMeta, WebsiteScraper, parse_html
 
 
 class ArthurChiaoNews(WebsiteScraper):
@@ -23,12 +22,12 @@ class ArthurChiaoNews(WebsiteScraper):
         articles: list[Article] = []
 
         try:
-            response = requests.get(self.ARTICLES_URL, timeout=30)
+            response = self.fetch(self.ARTICLES_URL, timeout=30)
             if response.status_code != 200:
                 print(f"HTTP {response.status_code} when fetching {self.ARTICLES_URL}")
                 return articles
 
-            soup = BeautifulSoup(response.text, "html.parser")
+            soup = parse_html(response)
 
             for item in soup.select("#articles ul.posts > li"):
                 date_span = item.select_one("span.date")
@@ -47,6 +46,10 @@ class ArthurChiaoNews(WebsiteScraper):
                 if not href:
                     continue
 
+                full_url = f"{self.BASE_URL}{href}" if href.startswith("/") else href
+                if self.is_known(full_url):
+                    continue
+
                 date_text = date_span.get_text(strip=True)
                 if not date_text:
                     continue
@@ -61,7 +64,6 @@ class ArthurChiaoNews(WebsiteScraper):
                 if published <= since:
                     continue
 
-                full_url = f"{self.BASE_URL}{href}" if href.startswith("/") else href
                 articles.append(
                     Article(
                         id=href,
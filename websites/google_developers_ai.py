@@ -1,9 +1,8 @@
 from datetime import datetime, timezone
 
 import requests
-from bs4 import BeautifulSoup
 
-from scrape2rss import Article, WebsiteMeta, WebsiteScraper
+from scrape2rss import Article, WebsiteMeta, WebsiteScraper, parse_html
 
 
 class GoogleDevelopersAINews(WebsiteScraper):
@@ -23,12 +22,12 @@ class GoogleDevelopersAINews(WebsiteScraper):
         articles: list[Article] = []
 
         try:
-            response = requests.get(self.SEARCH_URL, timeout=30)
+            response = self.fetch(self.SEARCH_URL, timeout=30)
             if response.status_code != 200:
                 print(f"HTTP {response.status_code} when fetching {self.SEARCH_URL}")
                 return articles
 
-            soup = BeautifulSoup(response.text, "html.parser")
+            soup = parse_html(response)
 
             for item in soup.select(
                 "div.search-results__results-wrapper ul > li.search-result"
@@ -1,7 +1,6 @@
 from datetime import datetime, timezone
-from scrape2rss import Article, WebsiteMeta, WebsiteScraper
+from scrape2rss import Article, WebsiteMeta, WebsiteScraper, parse_html
 import requests
-from bs4 import BeautifulSoup
 
 
 class KubeOvnNews(WebsiteScraper):
@@ -20,12 +19,12 @@ class KubeOvnNews(WebsiteScraper):
     def get_new_articles(self, since: datetime) -> list[Article]:
         articles: list[Article] = []
         try:
-            response = requests.get(self.NEWS_URL, timeout=30)
+            response = self.fetch(self.NEWS_URL, timeout=30)
             if response.status_code != 200:
                 print(f"HTTP {response.status_code} when fetching {self.NEWS_URL}")
                 return articles
 
-            soup = BeautifulSoup(response.text, "html.parser")
+            soup = parse_html(response)
             for item in soup.select("article.blog-index__post-wrapper"):
                 title_anchor = item.select_one("h3 a[href]")
                 if title_anchor is None:
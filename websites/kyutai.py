@@ -1,7 +1,6 @@
 from datetime import datetime, timezone
-from scrape2rss import Article, WebsiteMeta, WebsiteScraper
+from scrape2rss import Article, WebsiteMeta, WebsiteScraper, parse_html
 import requests
-from bs4 import BeautifulSoup
 
 
 class KyutaiNews(WebsiteScraper):
@@ -20,17 +19,25 @@ class KyutaiNews(WebsiteScraper):
     def get_new_articles(self, since: datetime) -> list[Article]:
         articles: list[Article] = []
         try:
-            response = requests.get(self.BLOG_URL, timeout=30)
+            response = self.fetch(self.BLOG_URL, timeout=30)
             if response.status_code != 200:
                 print(f"HTTP {response.status_code} when fetching {self.BLOG_URL}")
                 return articles
 
-            soup = BeautifulSoup(response.text, "html.parser")
+            soup = parse_html(response)
             for item in soup.find_all("li"):
                 anchor = item.find("a", href=True)
                 if anchor is None:
                     continue
 
+                href = anchor["href"].strip()
+                if not href:
+                    continue
+
+                full_url = f"{self.BASE_URL}{href}" if href.startswith("/") else href
+                if self.is_known(full_url):
+                    continue
+
                 title_span = anchor.find("span", class_="font-semibold")
                 title = title_span.get_text(strip=True) if title_span else None
                 if not title:
@@ -64,11 +71,6 @@ class KyutaiNews(WebsiteScraper):
                     else None
                 )
 
-                href = anchor["href"].strip()
-                if not href:
-                    continue
-
-                full_url = f"{self.BASE_URL}{href}" if href.startswith("/") else href
                 articles.append(
                     Article(
                         id=href,
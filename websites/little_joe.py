@@ -1,9 +1,8 @@
 from datetime import datetime, timezone
 
 import requests
-from bs4 import BeautifulSoup
 
-from scrape2rss import Article, WebsiteMeta, WebsiteScraper
+from scrape2rss import Article, WebsiteMeta, WebsiteScraper, parse_html
 
 
 class LittleJoBlogNews(WebsiteScraper):
@@ -22,12 +21,12 @@ class LittleJoBlogNews(WebsiteScraper):
         articles: list[Article] = []
 
         try:
-            response = requests.get(self.BLOG_URL, timeout=30)
+            response = self.fetch(self.BLOG_URL, timeout=30)
             if response.status_code != 200:
                 print(f"HTTP {response.status_code} when fetching {self.BLOG_URL}")
                 return articles
 
-            soup = BeautifulSoup(response.text, "html.parser")
+            soup = parse_html(response)
 
             for item in soup.select("section.space-y-10.w-full > article"):
                 anchor = item.select_one("header a[href]")
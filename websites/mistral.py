@@ -22,7 +22,7 @@ class ExampleNews(WebsiteScraper):
         articles = []
 
         try:
-            response = requests.get(self.CMS_URL, timeout=30)
+            response = self.fetch(self.CMS_URL, timeout=30)
             
             if response.status_code != 200:
                 print(f"HTTP {response.status_code} when fetching Mistral CMS")